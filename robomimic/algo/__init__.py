@@ -1,11 +1,67 @@
-from robomimic.algo.algo import register_algo_factory_func, algo_name_to_factory_func, algo_factory, Algo, PolicyAlgo, ValueAlgo, PlannerAlgo, HierarchicalAlgo, RolloutPolicy
-
-# note: these imports are needed to register these classes in the global algo registry
-from robomimic.algo.bc import BC, BC_Gaussian, BC_GMM, BC_VAE, BC_RNN, BC_RNN_GMM
-from robomimic.algo.bcq import BCQ, BCQ_GMM, BCQ_Distributional
-from robomimic.algo.cql import CQL
-from robomimic.algo.iql import IQL
-from robomimic.algo.gl import GL, GL_VAE, ValuePlanner
-from robomimic.algo.hbc import HBC
-from robomimic.algo.iris import IRIS
-from robomimic.algo.td3_bc import TD3_BC
+import os
+import importlib
+import threading
+
+import robomimic.algo.algo as AlgoBase
+from robomimic.algo.algo import register_algo_factory_func, algo_name_to_factory_func, algo_factory, Algo, PolicyAlgo, ValueAlgo, PlannerAlgo, HierarchicalAlgo, RolloutPolicy, ALGO_MODULES
+
+# note: the base classes and the algo registry in robomimic.algo.algo are imported eagerly above, but
+# the per-algorithm classes below are imported lazily on first attribute access (PEP 562), so that
+# importing this package does not pay the cost of importing every algorithm. The global algo registry
+# imports the module for an algo (see @ALGO_MODULES) the first time its factory function is looked up.
+LAZY_ALGO_CLASSES = {
+    "BC": "robomimic.algo.bc",
+    "BC_Gaussian": "robomimic.algo.bc",
+    "BC_GMM": "robomimic.algo.bc",
+    "BC_VAE": "robomimic.algo.bc",
+    "BC_RNN": "robomimic.algo.bc",
+    "BC_RNN_GMM": "robomimic.algo.bc",
+    "BC_Transformer": "robomimic.algo.bc",
+    "BC_Transformer_GMM": "robomimic.algo.bc",
+    "BCQ": "robomimic.algo.bcq",
+    "BCQ_GMM": "robomimic.algo.bcq",
+    "BCQ_Distributional": "robomimic.algo.bcq",
+    "CQL": "robomimic.algo.cql",
+    "IQL": "robomimic.algo.iql",
+    "GL": "robomimic.algo.gl",
+    "GL_VAE": "robomimic.algo.gl",
+    "ValuePlanner": "robomimic.algo.gl",
+    "HBC": "robomimic.algo.hbc",
+    "IRIS": "robomimic.algo.iris",
+    "TD3_BC": "robomimic.algo.td3_bc",
+}
+
+
+def __getattr__(name):
+    if name in LAZY_ALGO_CLASSES:
+        AlgoBase.wait_for_prefetch()
+        val = getattr(importlib.import_module(LAZY_ALGO_CLASSES[name]), name)
+        globals()[name] = val
+        return val
+    raise AttributeError("module {} has no attribute {}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(LAZY_ALGO_CLASSES))
+
+
+def prefetch_algos():
+    """
+    Starts a daemon thread that imports all algo modules in the background, so that the
+    cost of importing them overlaps with other work in the calling script. Importing modules
+    from two threads at once is not always safe (the import system can raise a deadlock
+    error when the modules import each other), so lazy lookups of algo classes and factory
+    functions wait for this thread to finish before importing anything themselves.
+    """
+    def _import_all():
+        for module_name in ALGO_MODULES.values():
+            importlib.import_module(module_name)
+    thread = threading.Thread(target=_import_all, daemon=True)
+    AlgoBase.PREFETCH_THREAD = thread
+    thread.start()
+    return thread
+
+
+# opt-in background import of algo modules
+if os.environ.get("ROBOMIMIC_PREFETCH_ALGOS", "0") == "1":
+    prefetch_algos()
@@ -7,10 +7,15 @@ These factory functions are registered into a global dictionary with the
 @register_algo_factory_func function decorator. This makes it easy for
 @algo_factory to instantiate the correct `Algo` subclass.
 """
+import sys
 import textwrap
+import importlib
+import threading
+import functools
 from copy import deepcopy
 from collections import OrderedDict
 
+import torch
 import torch.nn as nn
 
 import robomimic.utils.tensor_utils as TensorUtils
@@ -21,6 +26,19 @@ import robomimic.utils.obs_utils as ObsUtils
 # mapping from algo name to factory functions that map algo configs to algo class names
 REGISTERED_ALGO_FACTORY_FUNCS = OrderedDict()
 
+# mapping from algo name to the module that registers its factory function, so that
+# looking up an algo only needs to import the module that implements it
+ALGO_MODULES = OrderedDict([
+    ("bc", "robomimic.algo.bc"),
+    ("bcq", "robomimic.algo.bcq"),
+    ("cql", "robomimic.algo.cql"),
+    ("iql", "robomimic.algo.iql"),
+    ("gl", "robomimic.algo.gl"),
+    ("hbc", "robomimic.algo.hbc"),
+    ("iris", "robomimic.algo.iris"),
+    ("td3_bc", "robomimic.algo.td3_bc"),
+])
+
 
 def register_algo_factory_func(algo_name):
     """
@@ -31,17 +49,54 @@ def register_algo_factory_func(algo_name):
         algo_name (str): the algorithm name to register the algorithm under
     """
     def decorator(factory_func):
-        REGISTERED_ALGO_FACTORY_FUNCS[algo_name] = factory_func
+        # intern registry keys so that lookups with interned names can match on identity
+        REGISTERED_ALGO_FACTORY_FUNCS[sys.intern(algo_name)] = factory_func
+        # invalidate cached lookups, since this name may now resolve to a different function
+        algo_name_to_factory_func.cache_clear()
+        return factory_func
     return decorator
 
 
+# background thread that imports all algo modules, if started with @robomimic.algo.prefetch_algos
+PREFETCH_THREAD = None
+
+
+def wait_for_prefetch():
+    """
+    Waits for the background import of algo modules started by @robomimic.algo.prefetch_algos
+    (if any) to finish. Importing modules from two threads at once can raise a deadlock error
+    when the modules import each other, so lazy imports on other threads wait for it first.
+    """
+    thread = PREFETCH_THREAD
+    if thread is not None and thread is not threading.current_thread():
+        thread.join()
+
+
+def register_all_algos():
+    """
+    Imports every algorithm module so that their factory functions are registered.
+    Algorithm modules are imported lazily by the @robomimic.algo package, so this is
+    called when the registry is queried for a name that is not in @ALGO_MODULES.
+    """
+    for module_name in ALGO_MODULES.values():
+        importlib.import_module(module_name)
+
+
+@functools.lru_cache(maxsize=None)
 def algo_name_to_factory_func(algo_name):
     """
-    Uses registry to retrieve algo factory function from algo name.
+    Uses registry to retrieve algo factory function from algo name. Lookups are
+    cached, and the cache is invalidated whenever a new factory function is registered.
 
     Args:
         algo_name (str): the algorithm name
     """
+    if algo_name not in REGISTERED_ALGO_FACTORY_FUNCS:
+        wait_for_prefetch()
+        if algo_name in ALGO_MODULES:
+            importlib.import_module(ALGO_MODULES[algo_name])
+        else:
+            register_all_algos()
     return REGISTERED_ALGO_FACTORY_FUNCS[algo_name]
 
 
@@ -65,7 +120,7 @@ def algo_factory(algo_name, config, obs_key_shapes, ac_dim, device):
     assert algo_name == config.algo_name
 
     # use algo factory func to get algo class and kwargs from algo config
-    factory_func = algo_name_to_factory_func(algo_name)
+    factory_func = algo_name_to_factory_func(sys.intern(algo_name))
     algo_cls, algo_kwargs = factory_func(config.algo)
 
     # create algo instance
@@ -127,6 +182,9 @@ class Algo(object):
         self._create_optimizers()
         assert isinstance(self.nets, nn.ModuleDict)
 
+        # device copy of the observation normalization stats passed to @postprocess_batch_for_training
+        self._device_obs_normalization_stats = None
+
     def _create_shapes(self, obs_keys, obs_key_shapes):
         """
         Create obs_shapes, goal_shapes, and subgoal_shapes dictionaries, to make it
@@ -221,8 +279,15 @@ class Algo(object):
             batch (dict): postproceesed batch
         """
 
-        # ensure obs_normalization_stats are torch Tensors on proper device
-        obs_normalization_stats = TensorUtils.to_float(TensorUtils.to_device(TensorUtils.to_tensor(obs_normalization_stats), self.device))
+        # ensure obs_normalization_stats are torch Tensors on proper device - the same stats are passed
+        # for every batch, so the converted stats are cached and only re-created if different stats are passed
+        if obs_normalization_stats is not None:
+            if (self._device_obs_normalization_stats is None) or (self._device_obs_normalization_stats[0] is not obs_normalization_stats):
+                self._device_obs_normalization_stats = (
+                    obs_normalization_stats,
+                    TensorUtils.to_device_and_float(TensorUtils.to_tensor(obs_normalization_stats), self.device),
+                )
+            obs_normalization_stats = self._device_obs_normalization_stats[1]
 
         # we will search the nested batch dictionary for the following special batch dict keys
         # and apply the processing function to their values (which correspond to observations)
@@ -246,7 +311,7 @@ class Algo(object):
         recurse_helper(batch)
         return batch
 
-    def train_on_batch(self, batch, epoch, validate=False):
+    def train_on_batch(self, batch, epoch, validate=False, log=True):
         """
         Training on a single batch of data.
 
@@ -259,6 +324,9 @@ class Algo(object):
 
             validate (bool): if True, don't perform any learning updates.
 
+            log (bool): if False, the returned info will not be used for logging, so
+                outputs that are only needed for logging can be skipped.
+
         Returns:
             info (dict): dictionary of relevant inputs, outputs, and losses
                 that might be relevant for logging
@@ -479,6 +547,13 @@ class RolloutPolicy(object):
         self.policy = policy
         self.obs_normalization_stats = obs_normalization_stats
 
+        # obs_normalization_stats as float torch Tensors on the policy device - created on first use
+        self._device_obs_normalization_stats = None
+
+        # persistent pinned host buffers used to stage observations for asynchronous copies to the
+        # policy device, keyed by buffer name ("obs" or "goal") and observation key
+        self._pinned_buffers = dict()
+
     def start_episode(self):
         """
         Prepare the policy to start a new rollout.
@@ -486,24 +561,54 @@ class RolloutPolicy(object):
         self.policy.set_eval()
         self.policy.reset()
 
-    def _prepare_observation(self, ob):
+    def _to_policy_device(self, ob, buffer_name):
+        """
+        Moves a batched observation dictionary to the policy device, and converts it to float. On
+        CUDA devices, observations are staged in persistent pinned host buffers, so that the copies
+        to the device are asynchronous and no host memory is allocated per step.
+
+        Args:
+            ob (dict): observation dictionary with torch.Tensor values on CPU
+            buffer_name (str): name of the set of staging buffers to use - observations that are
+                prepared in the same step (e.g. observation and goal) must use different names
+        """
+        device = self.policy.device
+        if (device.type != "cuda") or (not all(isinstance(v, torch.Tensor) for v in ob.values())):
+            return TensorUtils.to_device_and_float(ob, device)
+        staged = dict()
+        for k, v in ob.items():
+            buf = self._pinned_buffers.get((buffer_name, k), None)
+            if (buf is None) or (buf.shape != v.shape) or (buf.dtype != v.dtype):
+                buf = torch.empty(v.shape, dtype=v.dtype, pin_memory=True)
+                self._pinned_buffers[(buffer_name, k)] = buf
+            # note: the previous copy out of this buffer has finished, since the action from the
+            # previous step was copied back to the host
+            buf.copy_(v)
+            staged[k] = buf
+        return TensorUtils.to_device_and_float(staged, device, non_blocking=True)
+
+    def _prepare_observation(self, ob, buffer_name="obs"):
         """
         Prepare raw observation dict from environment for policy.
 
         Args:
             ob (dict): single observation dictionary from environment (no batch dimension, 
                 and np.array values for each key)
+
+            buffer_name (str): name of the set of pinned staging buffers to use (see @_to_policy_device)
         """
         ob = TensorUtils.to_tensor(ob)
         ob = TensorUtils.to_batch(ob)
-        ob = TensorUtils.to_device(ob, self.policy.device)
-        ob = TensorUtils.to_float(ob)
+        ob = self._to_policy_device(ob, buffer_name=buffer_name)
         if self.obs_normalization_stats is not None:
-            # ensure obs_normalization_stats are torch Tensors on proper device
-            obs_normalization_stats = TensorUtils.to_float(TensorUtils.to_device(TensorUtils.to_tensor(self.obs_normalization_stats), self.policy.device))
+            # ensure obs_normalization_stats are torch Tensors on proper device - they do not change
+            # during rollouts, so they are only converted once
+            if self._device_obs_normalization_stats is None:
+                self._device_obs_normalization_stats = TensorUtils.to_device_and_float(
+                    TensorUtils.to_tensor(self.obs_normalization_stats), self.policy.device)
             # limit normalization to obs keys being used, in case environment includes extra keys
             ob = { k : ob[k] for k in self.policy.global_config.all_obs_keys }
-            ob = ObsUtils.normalize_obs(ob, obs_normalization_stats=obs_normalization_stats)
+            ob = ObsUtils.normalize_obs(ob, obs_normalization_stats=self._device_obs_normalization_stats)
         return ob
 
     def __repr__(self):
@@ -521,6 +626,6 @@ class RolloutPolicy(object):
         """
         ob = self._prepare_observation(ob)
         if goal is not None:
-            goal = self._prepare_observation(goal)
+            goal = self._prepare_observation(goal, buffer_name="goal")
         ac = self.policy.get_action(obs_dict=ob, goal_dict=goal)
         return TensorUtils.to_numpy(ac[0])
@@ -75,10 +75,143 @@ def algo_config_to_class(algo_config):
     return algo_class, algo_kwargs
 
 
+def policy_log_probs(policy, obs_dict, goal_dict, actions, batch_dims):
+    """
+    Computes the log-likelihood of @actions under the action distribution of a stochastic
+    @policy network. This is a standalone function so that the policy forward pass,
+    the construction of the distribution, and the log-likelihood reduction can all be
+    compiled together (see @BC._maybe_compile).
+
+    Args:
+        policy (nn.Module): policy network with a @forward_train method that returns
+            an action distribution
+        obs_dict (dict): batch of observations
+        goal_dict (dict): batch of goal observations (or None)
+        actions (torch.Tensor): batch of target actions
+        batch_dims (int): expected number of batch dimensions of the distribution
+
+    Returns:
+        log_probs (torch.Tensor): log-likelihoods of the actions
+    """
+    dists = policy.forward_train(obs_dict=obs_dict, goal_dict=goal_dict)
+
+    # make sure that this is a batch of multivariate action distributions, so that
+    # the log probability computation will be correct
+    assert len(dists.batch_shape) == batch_dims
+    return dists.log_prob(actions)
+
+
+def transformer_gmm_log_probs(policy, obs_dict, goal_dict, actions, last_step_only):
+    """
+    Computes the log-likelihood of @actions under the action distribution of a transformer
+    GMM @policy network. Like @policy_log_probs, this is a standalone function so that it
+    can be compiled as a whole (see @BC._maybe_compile).
+
+    Args:
+        policy (nn.Module): TransformerGMMActorNetwork instance
+        obs_dict (dict): batch of observation sequences
+        goal_dict (dict): batch of goal observations (or None)
+        actions (torch.Tensor): batch of target actions
+        last_step_only (bool): if True, only the final timestep prediction is evaluated,
+            and @actions should not have a temporal dimension
+
+    Returns:
+        log_probs (torch.Tensor): log-likelihoods of the actions
+    """
+    means, scales, logits = policy.forward_train_params(
+        obs_dict=obs_dict,
+        actions=None,
+        goal_dict=goal_dict,
+        low_noise_eval=False,
+        last_step_only=last_step_only,
+    )
+
+    if last_step_only:
+        # only the final timestep was predicted - remove the temporal dimension of size 1
+        means, scales, logits = means[:, -1], scales[:, -1], logits[:, -1]
+
+    if not policy.use_tanh:
+        # compute the mixture log-likelihood directly from the parameters, without distribution objects
+        return LossUtils.gmm_log_prob(actions, means, scales, logits)
+
+    dists = policy.dist_from_params(means, scales, logits)
+
+    # make sure that this is a batch of multivariate action distributions, so that
+    # the log probability computation will be correct
+    assert len(dists.batch_shape) == (1 if last_step_only else 2) # [B] or [B, T]
+
+    return dists.log_prob(actions)
+
+
 class BC(PolicyAlgo):
     """
     Normal BC training.
     """
+    def __init__(self, *args, **kwargs):
+        super(BC, self).__init__(*args, **kwargs)
+
+        # optionally use channels_last (NHWC) memory format, which conv-heavy encoders run faster
+        # with on recent GPUs. Parameters are converted in-place, so optimizers remain valid.
+        # Legacy configs may not have this key.
+        self._channels_last = self.global_config.train.get("channels_last", False)
+        if self._channels_last:
+            self.nets = self.nets.to(memory_format=torch.channels_last)
+
+        # optionally run forward passes under autocast for mixed precision training. Float16
+        # additionally needs loss scaling to avoid gradient underflow. Legacy configs may not
+        # have this key.
+        mixed_precision = self.global_config.train.get("mixed_precision", None)
+        assert mixed_precision in [None, "bf16", "fp16"]
+        self._amp_dtype = {None: None, "bf16": torch.bfloat16, "fp16": torch.float16}[mixed_precision]
+        self._grad_scaler = torch.cuda.amp.GradScaler() if mixed_precision == "fp16" else None
+
+        # l2, l1, and cosine action loss weights, kept on device for @_compute_losses
+        action_loss_weights = [
+            self.algo_config.loss.l2_weight,
+            self.algo_config.loss.l1_weight,
+            self.algo_config.loss.cos_weight,
+        ]
+        self._action_loss_weights = torch.tensor(action_loss_weights, dtype=torch.float32, device=self.device)
+
+        # action losses with zero weight are only computed for logging
+        self._action_loss_in_graph = tuple(w != 0. for w in action_loss_weights)
+
+        # optionally compile policy forward passes - compilation happens lazily (see @_maybe_compile),
+        # so only the code paths that are actually used (training or rollouts) get compiled.
+        # Legacy configs may not have this key.
+        self._compile = self.global_config.train.get("compile", False)
+        assert (not self._compile) or hasattr(torch, "compile"), "train.compile requires torch >= 2.0"
+        self._compiled_fns = dict()
+
+    def _maybe_compile(self, name, fn):
+        """
+        Returns a compiled version of @fn if train.compile is set, and @fn otherwise. Compiled
+        functions are cached under @name, so that they are only compiled once. Input shapes
+        are fixed during training and rollouts (recompilation happens if they do change),
+        so functions are compiled for static shapes.
+
+        Args:
+            name (str): name to cache the compiled function under
+            fn (function or nn.Module): function to compile
+
+        Returns:
+            fn (function or nn.Module): function to call
+        """
+        if not self._compile:
+            return fn
+        if name not in self._compiled_fns:
+            # CUDA graphs remove most of the kernel launch overhead for these small networks
+            mode = "reduce-overhead" if self.device.type == "cuda" else "default"
+            self._compiled_fns[name] = torch.compile(fn, mode=mode, dynamic=False)
+        return self._compiled_fns[name]
+
+    def _autocast(self):
+        """
+        Returns an autocast context for the configured mixed precision dtype (a no-op context
+        if mixed precision is disabled). Used for both training and rollout forward passes.
+        """
+        return torch.autocast(device_type=self.device.type, dtype=self._amp_dtype, enabled=(self._amp_dtype is not None))
+
     def _create_networks(self):
         """
         Creates networks and places them into @self.nets.
@@ -107,15 +240,23 @@ class BC(PolicyAlgo):
                 will be used for training 
         """
         input_batch = dict()
-        input_batch["obs"] = {k: batch["obs"][k][:, 0, :] for k in batch["obs"]}
+        input_batch["obs"] = {k: batch["obs"][k].select(1, 0) for k in batch["obs"]}
         input_batch["goal_obs"] = batch.get("goal_obs", None) # goals may not be present
-        input_batch["actions"] = batch["actions"][:, 0, :]
+        input_batch["actions"] = batch["actions"].select(1, 0)
         # we move to device first before float conversion because image observation modalities will be uint8 -
-        # this minimizes the amount of data transferred to GPU
-        return TensorUtils.to_float(TensorUtils.to_device(input_batch, self.device))
+        # this minimizes the amount of data transferred to GPU. The copy is non-blocking so that it can
+        # overlap with host work when the data loader uses pinned memory.
+        input_batch = TensorUtils.to_device_and_float(input_batch, self.device, non_blocking=True)
+        if self._channels_last:
+            # image observations are the only 4D tensors here (B, C, H, W)
+            input_batch["obs"] = TensorUtils.map_tensor(
+                input_batch["obs"],
+                lambda x: x.contiguous(memory_format=torch.channels_last) if x.dim() == 4 else x,
+            )
+        return input_batch
 
 
-    def train_on_batch(self, batch, epoch, validate=False):
+    def train_on_batch(self, batch, epoch, validate=False, log=True):
         """
         Training on a single batch of data.
 
@@ -128,17 +269,25 @@ class BC(PolicyAlgo):
 
             validate (bool): if True, don't perform any learning updates.
 
+            log (bool): if False, the returned info will not be used for logging, so
+                outputs that are only needed for logging can be skipped.
+
         Returns:
             info (dict): dictionary of relevant inputs, outputs, and losses
                 that might be relevant for logging
         """
         with TorchUtils.maybe_no_grad(no_grad=validate):
             info = super(BC, self).train_on_batch(batch, epoch, validate=validate)
-            predictions = self._forward_training(batch)
+            with self._autocast():
+                predictions = self._forward_training(batch)
+            if self._amp_dtype is not None:
+                # compute losses in full precision
+                predictions = TensorUtils.to_float(predictions)
             losses = self._compute_losses(predictions, batch)
 
-            info["predictions"] = TensorUtils.detach(predictions)
-            info["losses"] = TensorUtils.detach(losses)
+            if log:
+                info["predictions"] = TensorUtils.detach(predictions)
+                info["losses"] = TensorUtils.detach(losses)
 
             if not validate:
                 step_info = self._train_step(losses)
@@ -158,8 +307,9 @@ class BC(PolicyAlgo):
         Returns:
             predictions (dict): dictionary containing network outputs
         """
-        predictions = OrderedDict()
-        actions = self.nets["policy"](obs_dict=batch["obs"], goal_dict=batch["goal_obs"])
+        predictions = dict()
+        policy = self._maybe_compile("policy", self.nets["policy"])
+        actions = policy(obs_dict=batch["obs"], goal_dict=batch["goal_obs"])
         predictions["actions"] = actions
         return predictions
 
@@ -176,20 +326,19 @@ class BC(PolicyAlgo):
         Returns:
             losses (dict): dictionary of losses computed over the batch
         """
-        losses = OrderedDict()
+        losses = dict()
         a_target = batch["actions"]
         actions = predictions["actions"]
-        losses["l2_loss"] = nn.MSELoss()(actions, a_target)
-        losses["l1_loss"] = nn.SmoothL1Loss()(actions, a_target)
-        # cosine direction loss on eef delta position
-        losses["cos_loss"] = LossUtils.cosine_loss(actions[..., :3], a_target[..., :3])
+        # l2, smooth l1, and cosine direction loss on eef delta position, computed in one pass
+        losses["l2_loss"], losses["l1_loss"], losses["cos_loss"] = LossUtils.action_losses(actions, a_target)
 
+        # weighted sum of the action losses as a single dot product - losses with zero weight are
+        # detached so that backward does not traverse their branches
         action_losses = [
-            self.algo_config.loss.l2_weight * losses["l2_loss"],
-            self.algo_config.loss.l1_weight * losses["l1_loss"],
-            self.algo_config.loss.cos_weight * losses["cos_loss"],
+            loss if in_graph else loss.detach()
+            for loss, in_graph in zip((losses["l2_loss"], losses["l1_loss"], losses["cos_loss"]), self._action_loss_in_graph)
         ]
-        action_loss = sum(action_losses)
+        action_loss = torch.stack(action_losses).dot(self._action_loss_weights)
         losses["action_loss"] = action_loss
         return losses
 
@@ -203,11 +352,12 @@ class BC(PolicyAlgo):
         """
 
         # gradient step
-        info = OrderedDict()
+        info = dict()
         policy_grad_norms = TorchUtils.backprop_for_loss(
             net=self.nets["policy"],
             optim=self.optimizers["policy"],
             loss=losses["action_loss"],
+            grad_scaler=self._grad_scaler,
         )
         info["policy_grad_norms"] = policy_grad_norms
         return info
@@ -224,17 +374,19 @@ class BC(PolicyAlgo):
             loss_log (dict): name -> summary statistic
         """
         log = super(BC, self).log_info(info)
-        log["Loss"] = info["losses"]["action_loss"].item()
-        if "l2_loss" in info["losses"]:
-            log["L2_Loss"] = info["losses"]["l2_loss"].item()
-        if "l1_loss" in info["losses"]:
-            log["L1_Loss"] = info["losses"]["l1_loss"].item()
-        if "cos_loss" in info["losses"]:
-            log["Cosine_Loss"] = info["losses"]["cos_loss"].item()
+        losses = TensorUtils.scalars_to_floats(info["losses"])
+        log["Loss"] = losses["action_loss"]
+        if "l2_loss" in losses:
+            log["L2_Loss"] = losses["l2_loss"]
+        if "l1_loss" in losses:
+            log["L1_Loss"] = losses["l1_loss"]
+        if "cos_loss" in losses:
+            log["Cosine_Loss"] = losses["cos_loss"]
         if "policy_grad_norms" in info:
             log["Policy_Grad_Norms"] = info["policy_grad_norms"]
         return log
 
+    @torch.inference_mode()
     def get_action(self, obs_dict, goal_dict=None):
         """
         Get policy action outputs.
@@ -247,7 +399,9 @@ class BC(PolicyAlgo):
             action (torch.Tensor): action tensor
         """
         assert not self.nets.training
-        return self.nets["policy"](obs_dict, goal_dict=goal_dict)
+        with self._autocast():
+            action = self.nets["policy"](obs_dict, goal_dict=goal_dict)
+        return action.float()
 
 
 class BC_Gaussian(BC):
@@ -288,17 +442,15 @@ class BC_Gaussian(BC):
         Returns:
             predictions (dict): dictionary containing network outputs
         """
-        dists = self.nets["policy"].forward_train(
-            obs_dict=batch["obs"], 
+        log_probs = self._maybe_compile("policy_log_probs", policy_log_probs)(
+            self.nets["policy"],
+            obs_dict=batch["obs"],
             goal_dict=batch["goal_obs"],
+            actions=batch["actions"],
+            batch_dims=1,
         )
 
-        # make sure that this is a batch of multivariate action distributions, so that
-        # the log probability computation will be correct
-        assert len(dists.batch_shape) == 1
-        log_probs = dists.log_prob(batch["actions"])
-
-        predictions = OrderedDict(
+        predictions = dict(
             log_probs=log_probs,
         )
         return predictions
@@ -319,7 +471,7 @@ class BC_Gaussian(BC):
 
         # loss is just negative log-likelihood of action targets
         action_loss = -predictions["log_probs"].mean()
-        return OrderedDict(
+        return dict(
             log_probs=-action_loss,
             action_loss=action_loss,
         )
@@ -336,8 +488,9 @@ class BC_Gaussian(BC):
             loss_log (dict): name -> summary statistic
         """
         log = PolicyAlgo.log_info(self, info)
-        log["Loss"] = info["losses"]["action_loss"].item()
-        log["Log_Likelihood"] = info["losses"]["log_probs"].item() 
+        losses = TensorUtils.scalars_to_floats(info["losses"])
+        log["Loss"] = losses["action_loss"]
+        log["Log_Likelihood"] = losses["log_probs"]
         if "policy_grad_norms" in info:
             log["Policy_Grad_Norms"] = info["policy_grad_norms"]
         return log
@@ -389,7 +542,7 @@ class BC_VAE(BC):
         
         self.nets = self.nets.float().to(self.device)
 
-    def train_on_batch(self, batch, epoch, validate=False):
+    def train_on_batch(self, batch, epoch, validate=False, log=True):
         """
         Update from superclass to set categorical temperature, for categorical VAEs.
         """
@@ -397,7 +550,7 @@ class BC_VAE(BC):
             temperature = self.algo_config.vae.prior.categorical_init_temp - epoch * self.algo_config.vae.prior.categorical_temp_anneal_step
             temperature = max(temperature, self.algo_config.vae.prior.categorical_min_temp)
             self.nets["policy"].set_gumbel_temperature(temperature)
-        return super(BC_VAE, self).train_on_batch(batch, epoch, validate=validate)
+        return super(BC_VAE, self).train_on_batch(batch, epoch, validate=validate, log=log)
 
     def _forward_training(self, batch):
         """
@@ -419,16 +572,15 @@ class BC_VAE(BC):
         )
 
         vae_outputs = self.nets["policy"].forward_train(**vae_inputs)
-        predictions = OrderedDict(
+        predictions = dict(
             actions=vae_outputs["decoder_outputs"],
             kl_loss=vae_outputs["kl_loss"],
             reconstruction_loss=vae_outputs["reconstruction_loss"],
             encoder_z=vae_outputs["encoder_z"],
         )
         if not self.algo_config.vae.prior.use_categorical:
-            with torch.no_grad():
-                encoder_variance = torch.exp(vae_outputs["encoder_params"]["logvar"])
-            predictions["encoder_variance"] = encoder_variance
+            # encoder variance is only needed for logging, so it is computed in @log_info
+            predictions["encoder_logvar"] = vae_outputs["encoder_params"]["logvar"]
         return predictions
 
     def _compute_losses(self, predictions, batch):
@@ -449,7 +601,7 @@ class BC_VAE(BC):
         kl_loss = predictions["kl_loss"]
         recons_loss = predictions["reconstruction_loss"]
         action_loss = recons_loss + self.algo_config.vae.kl_weight * kl_loss
-        return OrderedDict(
+        return dict(
             recons_loss=recons_loss,
             kl_loss=kl_loss,
             action_loss=action_loss,
@@ -467,13 +619,17 @@ class BC_VAE(BC):
             loss_log (dict): name -> summary statistic
         """
         log = PolicyAlgo.log_info(self, info)
-        log["Loss"] = info["losses"]["action_loss"].item()
-        log["KL_Loss"] = info["losses"]["kl_loss"].item()
-        log["Reconstruction_Loss"] = info["losses"]["recons_loss"].item()
+        scalars = OrderedDict(info["losses"])
+        if not self.algo_config.vae.prior.use_categorical:
+            scalars["encoder_variance"] = torch.exp(info["predictions"]["encoder_logvar"]).mean()
+        scalars = TensorUtils.scalars_to_floats(scalars)
+        log["Loss"] = scalars["action_loss"]
+        log["KL_Loss"] = scalars["kl_loss"]
+        log["Reconstruction_Loss"] = scalars["recons_loss"]
         if self.algo_config.vae.prior.use_categorical:
             log["Gumbel_Temperature"] = self.nets["policy"].get_gumbel_temperature()
         else:
-            log["Encoder_Variance"] = info["predictions"]["encoder_variance"].mean().item()
+            log["Encoder_Variance"] = scalars["encoder_variance"]
         if "policy_grad_norms" in info:
             log["Policy_Grad_Norms"] = info["policy_grad_norms"]
         return log
@@ -497,13 +653,21 @@ class BC_RNN(BC):
             **BaseNets.rnn_args_from_config(self.algo_config.rnn),
         )
 
+        self._set_params_from_config()
+        self.nets = self.nets.float().to(self.device)
+
+    def _set_params_from_config(self):
+        """
+        Read specific config variables we need for training / eval.
+        Called by @_create_networks method
+        """
         self._rnn_hidden_state = None
+        self._rnn_init_state = None
+        self._rnn_init_state_batch_size = None
         self._rnn_horizon = self.algo_config.rnn.horizon
         self._rnn_counter = 0
         self._rnn_is_open_loop = self.algo_config.rnn.get("open_loop", False)
 
-        self.nets = self.nets.float().to(self.device)
-
     def process_batch_for_training(self, batch):
         """
         Processes input batch from a data loader to filter out
@@ -525,15 +689,19 @@ class BC_RNN(BC):
         if self._rnn_is_open_loop:
             # replace the observation sequence with one that only consists of the first observation.
             # This way, all actions are predicted "open-loop" after the first observation, based
-            # on the rnn hidden state.
+            # on the rnn hidden state. Only the first observation is moved to device and converted,
+            # and the time dimension is expanded afterwards (expand does not copy memory).
             n_steps = batch["actions"].shape[1]
-            obs_seq_start = TensorUtils.index_at_time(batch["obs"], ind=0)
-            input_batch["obs"] = TensorUtils.unsqueeze_expand_at(obs_seq_start, size=n_steps, dim=1)
+            input_batch["obs"] = TensorUtils.index_at_time(batch["obs"], ind=0)
+            input_batch = TensorUtils.to_device_and_float(input_batch, self.device, non_blocking=True)
+            input_batch["obs"] = TensorUtils.unsqueeze_expand_at(input_batch["obs"], size=n_steps, dim=1)
+            return input_batch
 
         # we move to device first before float conversion because image observation modalities will be uint8 -
         # this minimizes the amount of data transferred to GPU
-        return TensorUtils.to_float(TensorUtils.to_device(input_batch, self.device))
+        return TensorUtils.to_device_and_float(input_batch, self.device, non_blocking=True)
 
+    @torch.inference_mode()
     def get_action(self, obs_dict, goal_dict=None):
         """
         Get policy action outputs.
@@ -549,22 +717,39 @@ class BC_RNN(BC):
 
         if self._rnn_hidden_state is None or self._rnn_counter % self._rnn_horizon == 0:
             batch_size = list(obs_dict.values())[0].shape[0]
-            self._rnn_hidden_state = self.nets["policy"].get_rnn_init_state(batch_size=batch_size, device=self.device)
+            if self._rnn_init_state is None or self._rnn_init_state_batch_size != batch_size:
+                # the RNN never modifies its initial state in-place, so the zero state can be reused
+                # at every horizon boundary and is only re-allocated when the batch size changes
+                self._rnn_init_state = self.nets["policy"].get_rnn_init_state(batch_size=batch_size, device=self.device)
+                self._rnn_init_state_batch_size = batch_size
+            self._rnn_hidden_state = self._rnn_init_state
 
             if self._rnn_is_open_loop:
                 # remember the initial observation, and use it instead of the current observation
-                # for open-loop action sequence prediction
+                # for open-loop action sequence prediction. Without goals, the encoder inputs are
+                # the same at every step, so the observation encoder is only run once per horizon.
                 self._open_loop_obs = TensorUtils.clone(TensorUtils.detach(obs_dict))
+                self._open_loop_rnn_inputs = None
+                if goal_dict is None:
+                    with self._autocast():
+                        self._open_loop_rnn_inputs = self.nets["policy"].encode_step(self._open_loop_obs, goal_dict=None)
 
         obs_to_use = obs_dict
+        rnn_inputs = None
         if self._rnn_is_open_loop:
             # replace current obs with last recorded obs
             obs_to_use = self._open_loop_obs
+            if goal_dict is None:
+                # goals can change within a horizon (e.g. HBC subgoals), so the recorded obs is
+                # re-encoded together with the current goal whenever one is provided
+                rnn_inputs = self._open_loop_rnn_inputs
 
         self._rnn_counter += 1
-        action, self._rnn_hidden_state = self.nets["policy"].forward_step(
-            obs_to_use, goal_dict=goal_dict, rnn_state=self._rnn_hidden_state)
-        return action
+        forward_step = self._maybe_compile("policy_step", self.nets["policy"].forward_step)
+        with self._autocast():
+            action, self._rnn_hidden_state = forward_step(
+                obs_to_use, goal_dict=goal_dict, rnn_state=self._rnn_hidden_state, rnn_inputs=rnn_inputs)
+        return action.float()
 
     def reset(self):
         """
@@ -599,11 +784,7 @@ class BC_RNN_GMM(BC_RNN):
             **BaseNets.rnn_args_from_config(self.algo_config.rnn),
         )
 
-        self._rnn_hidden_state = None
-        self._rnn_horizon = self.algo_config.rnn.horizon
-        self._rnn_counter = 0
-        self._rnn_is_open_loop = self.algo_config.rnn.get("open_loop", False)
-
+        self._set_params_from_config()
         self.nets = self.nets.float().to(self.device)
 
     def _forward_training(self, batch):
@@ -618,17 +799,15 @@ class BC_RNN_GMM(BC_RNN):
         Returns:
             predictions (dict): dictionary containing network outputs
         """
-        dists = self.nets["policy"].forward_train(
-            obs_dict=batch["obs"], 
+        log_probs = self._maybe_compile("policy_log_probs", policy_log_probs)(
+            self.nets["policy"],
+            obs_dict=batch["obs"],
             goal_dict=batch["goal_obs"],
+            actions=batch["actions"],
+            batch_dims=2, # [B, T]
         )
 
-        # make sure that this is a batch of multivariate action distributions, so that
-        # the log probability computation will be correct
-        assert len(dists.batch_shape) == 2 # [B, T]
-        log_probs = dists.log_prob(batch["actions"])
-
-        predictions = OrderedDict(
+        predictions = dict(
             log_probs=log_probs,
         )
         return predictions
@@ -649,7 +828,7 @@ class BC_RNN_GMM(BC_RNN):
 
         # loss is just negative log-likelihood of action targets
         action_loss = -predictions["log_probs"].mean()
-        return OrderedDict(
+        return dict(
             log_probs=-action_loss,
             action_loss=action_loss,
         )
@@ -666,8 +845,9 @@ class BC_RNN_GMM(BC_RNN):
             loss_log (dict): name -> summary statistic
         """
         log = PolicyAlgo.log_info(self, info)
-        log["Loss"] = info["losses"]["action_loss"].item()
-        log["Log_Likelihood"] = info["losses"]["log_probs"].item() 
+        losses = TensorUtils.scalars_to_floats(info["losses"])
+        log["Loss"] = losses["action_loss"]
+        log["Log_Likelihood"] = losses["log_probs"]
         if "policy_grad_norms" in info:
             log["Policy_Grad_Norms"] = info["policy_grad_norms"]
         return log
@@ -702,6 +882,14 @@ class BC_Transformer(BC):
         self.context_length = self.algo_config.transformer.context_length
         self.supervise_all_steps = self.algo_config.transformer.supervise_all_steps
 
+        # ahead-of-time compiled policy for rollouts (see @export_for_inference)
+        self._aot_policy = None
+
+        # captured CUDA graph for rollouts, with its static input / output buffers (see @capture_inference_graph)
+        self._inference_graph = None
+        self._inference_graph_inputs = None
+        self._inference_graph_output = None
+
     def process_batch_for_training(self, batch):
         """
         Processes input batch from a data loader to filter out
@@ -725,8 +913,11 @@ class BC_Transformer(BC):
             # just use current timestep
             input_batch["actions"] = batch["actions"][:, h-1, :]
 
-        input_batch = TensorUtils.to_device(TensorUtils.to_float(input_batch), self.device)
-        return input_batch
+        input_batch = TensorUtils.to_device_and_float(input_batch, self.device, non_blocking=True)
+        # the context window slices above are strided views when the sampled sequences are longer than
+        # the context. Make them contiguous once here, instead of letting every downstream reshape and
+        # matmul in the policy copy them (this is a no-op for tensors that are already contiguous).
+        return TensorUtils.contiguous(input_batch)
 
     def _forward_training(self, batch, epoch=None):
         """
@@ -748,13 +939,20 @@ class BC_Transformer(BC):
             msg="Error: expect temporal dimension of obs batch to match transformer context length {}".format(self.context_length),
         )
 
-        predictions = OrderedDict()
-        predictions["actions"] = self.nets["policy"](obs_dict=batch["obs"], actions=None, goal_dict=batch["goal_obs"])
+        policy = self._maybe_compile("policy", self.nets["policy"])
+        predictions = dict()
+        predictions["actions"] = policy(
+            obs_dict=batch["obs"],
+            actions=None,
+            goal_dict=batch["goal_obs"],
+            last_step_only=(not self.supervise_all_steps),
+        )
         if not self.supervise_all_steps:
             # only supervise final timestep
             predictions["actions"] = predictions["actions"][:, -1, :]
         return predictions
 
+    @torch.inference_mode()
     def get_action(self, obs_dict, goal_dict=None):
         """
         Get policy action outputs.
@@ -766,7 +964,92 @@ class BC_Transformer(BC):
         """
         assert not self.nets.training
 
-        return self.nets["policy"](obs_dict, actions=None, goal_dict=goal_dict)[:, -1, :]
+        if self._inference_graph is not None:
+            # copy inputs into the static buffers and replay the captured forward pass
+            for name, inputs in [("obs_dict", obs_dict), ("goal_dict", goal_dict)]:
+                if inputs is None:
+                    continue
+                for k in inputs:
+                    self._inference_graph_inputs[name][k].copy_(inputs[k], non_blocking=True)
+            self._inference_graph.replay()
+            return self._inference_graph_output.clone()
+
+        if self._aot_policy is not None:
+            policy = self._aot_policy
+        else:
+            policy = self._maybe_compile("policy_eval", self.nets["policy"])
+        with self._autocast():
+            # pass inputs by keyword, exactly as in @export_for_inference - the compiled graph checks
+            # that its inputs have the same structure as the example inputs it was exported with
+            action = policy(obs_dict=obs_dict, actions=None, goal_dict=goal_dict, last_step_only=True)[:, -1, :]
+        return action.float()
+
+    def export_for_inference(self, obs_dict, goal_dict=None):
+        """
+        Ahead-of-time compiles the policy forward pass with torch.export and AOTInductor, so that
+        @get_action runs a single shape-specialized compiled graph instead of the eager model.
+        This is opt-in and meant for deployment - the compiled graph bakes in the current network
+        weights, so it should be called after the checkpoint has been loaded, and rollouts must use
+        the same observation shapes as the example inputs. Requires torch >= 2.6, which provides
+        the public AOTInductor packaging API.
+
+        Args:
+            obs_dict (dict): example observation batch with the shapes used at rollout time,
+                where each tensor has shape [B, T, ...] with T = context length
+            goal_dict (dict): (optional) example goal batch
+        """
+        assert not self.nets.training
+        torch_version = tuple(int(v) for v in torch.__version__.split("+")[0].split(".")[:2])
+        if torch_version < (2, 6):
+            raise RuntimeError("export_for_inference requires torch >= 2.6, found {}".format(torch.__version__))
+        example_kwargs = dict(obs_dict=obs_dict, actions=None, goal_dict=goal_dict, last_step_only=True)
+        with torch.no_grad():
+            exported = torch.export.export(self.nets["policy"], args=(), kwargs=example_kwargs)
+            package_path = torch._inductor.aoti_compile_and_package(exported)
+        self._aot_policy = torch._inductor.aoti_load_package(package_path)
+
+    @torch.inference_mode()
+    def capture_inference_graph(self, obs_dict, goal_dict=None, num_warmup_steps=3):
+        """
+        Captures the rollout forward pass in a CUDA graph, so that @get_action only needs to copy
+        the current inputs into persistent buffers and replay the graph, instead of launching every
+        kernel from Python. This is opt-in, and rollouts must use the same observation (and goal)
+        shapes as the example inputs. The graph reads the network parameters in-place, so it
+        remains valid if the weights are loaded after capture.
+
+        Args:
+            obs_dict (dict): example observation batch with the shapes used at rollout time,
+                where each tensor has shape [B, T, ...] with T = context length
+            goal_dict (dict): (optional) example goal batch
+            num_warmup_steps (int): number of forward passes to run on a side stream before capture
+        """
+        assert not self.nets.training
+        assert self.device.type == "cuda", "CUDA graphs require a CUDA device"
+
+        # persistent input buffers that @get_action copies into
+        static_inputs = TensorUtils.clone(dict(obs_dict=obs_dict, goal_dict=goal_dict))
+
+        def policy_step():
+            with self._autocast():
+                action = self.nets["policy"](
+                    static_inputs["obs_dict"], actions=None, goal_dict=static_inputs["goal_dict"], last_step_only=True)[:, -1, :]
+            return action.float()
+
+        # warmup on a side stream, so that lazy initialization (e.g. cuBLAS workspaces) is not captured
+        stream = torch.cuda.Stream()
+        stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(stream):
+            for _ in range(num_warmup_steps):
+                policy_step()
+        torch.cuda.current_stream().wait_stream(stream)
+
+        graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(graph):
+            static_output = policy_step()
+
+        self._inference_graph = graph
+        self._inference_graph_inputs = static_inputs
+        self._inference_graph_output = static_output
 
 
 class BC_Transformer_GMM(BC_Transformer):
@@ -807,34 +1090,15 @@ class BC_Transformer_GMM(BC_Transformer):
             msg="Error: expect temporal dimension of obs batch to match transformer context length {}".format(self.context_length),
         )
 
-        dists = self.nets["policy"].forward_train(
-            obs_dict=batch["obs"], 
-            actions=None,
+        log_probs = self._maybe_compile("policy_log_probs", transformer_gmm_log_probs)(
+            self.nets["policy"],
+            obs_dict=batch["obs"],
             goal_dict=batch["goal_obs"],
-            low_noise_eval=False,
+            actions=batch["actions"],
+            last_step_only=(not self.supervise_all_steps),
         )
 
-        # make sure that this is a batch of multivariate action distributions, so that
-        # the log probability computation will be correct
-        assert len(dists.batch_shape) == 2 # [B, T]
-
-        if not self.supervise_all_steps:
-            # only use final timestep prediction by making a new distribution with only final timestep.
-            # This essentially does `dists = dists[:, -1]`
-            component_distribution = D.Normal(
-                loc=dists.component_distribution.base_dist.loc[:, -1],
-                scale=dists.component_distribution.base_dist.scale[:, -1],
-            )
-            component_distribution = D.Independent(component_distribution, 1)
-            mixture_distribution = D.Categorical(logits=dists.mixture_distribution.logits[:, -1])
-            dists = D.MixtureSameFamily(
-                mixture_distribution=mixture_distribution,
-                component_distribution=component_distribution,
-            )
-
-        log_probs = dists.log_prob(batch["actions"])
-
-        predictions = OrderedDict(
+        predictions = dict(
             log_probs=log_probs,
         )
         return predictions
@@ -853,7 +1117,7 @@ class BC_Transformer_GMM(BC_Transformer):
 
         # loss is just negative log-likelihood of action targets
         action_loss = -predictions["log_probs"].mean()
-        return OrderedDict(
+        return dict(
             log_probs=-action_loss,
             action_loss=action_loss,
         )
@@ -868,8 +1132,9 @@ class BC_Transformer_GMM(BC_Transformer):
             loss_log (dict): name -> summary statistic
         """
         log = PolicyAlgo.log_info(self, info)
-        log["Loss"] = info["losses"]["action_loss"].item()
-        log["Log_Likelihood"] = info["losses"]["log_probs"].item() 
+        losses = TensorUtils.scalars_to_floats(info["losses"])
+        log["Loss"] = losses["action_loss"]
+        log["Log_Likelihood"] = losses["log_probs"]
         if "policy_grad_norms" in info:
             log["Policy_Grad_Norms"] = info["policy_grad_norms"]
         return log
@@ -184,7 +184,7 @@ class BCQ(PolicyAlgo, ValueAlgo):
 
         # single timestep reward is discounted sum of intermediate rewards in sequence
         reward_seq = batch["rewards"][:, :n_step]
-        discounts = torch.pow(self.algo_config.discount, torch.arange(n_step).float()).unsqueeze(0)
+        discounts = TorchUtils.n_step_discounts(self.algo_config.discount, n_step)
         input_batch["rewards"] = (reward_seq * discounts).sum(dim=1).unsqueeze(1)
 
         # discount rate will be gamma^N for computing n-step returns
@@ -196,14 +196,14 @@ class BCQ(PolicyAlgo, ValueAlgo):
         input_batch["dones"] = (done_seq.sum(dim=1) > 0).float().unsqueeze(1)
 
         if self.algo_config.infinite_horizon:
-            # scale terminal rewards by 1 / (1 - gamma) for infinite horizon MDPs
-            done_inds = input_batch["dones"].round().long().nonzero(as_tuple=False)[:, 0]
-            if done_inds.shape[0] > 0:
-                input_batch["rewards"][done_inds] = input_batch["rewards"][done_inds] * (1. / (1. - self.discount))
+            # scale terminal rewards by 1 / (1 - gamma) for infinite horizon MDPs, using a mask
+            # instead of gathering and scattering the terminal indices
+            rewards = input_batch["rewards"]
+            input_batch["rewards"] = torch.where(input_batch["dones"] > 0.5, rewards * (1. / (1. - self.discount)), rewards)
 
         # we move to device first before float conversion because image observation modalities will be uint8 -
         # this minimizes the amount of data transferred to GPU
-        return TensorUtils.to_float(TensorUtils.to_device(input_batch, self.device))
+        return TensorUtils.to_device_and_float(input_batch, self.device, non_blocking=True)
 
     def _train_action_sampler_on_batch(self, batch, epoch, no_backprop=False):
         """
@@ -529,12 +529,12 @@ class BCQ(PolicyAlgo, ValueAlgo):
         """
         q_estimated = critic(states, actions, goal_states)
         if self.algo_config.critic.use_huber:
-            critic_loss = nn.SmoothL1Loss()(q_estimated, q_targets)
+            critic_loss = F.smooth_l1_loss(q_estimated, q_targets)
         else:
-            critic_loss = nn.MSELoss()(q_estimated, q_targets)
+            critic_loss = F.mse_loss(q_estimated, q_targets)
         return critic_loss, None
 
-    def train_on_batch(self, batch, epoch, validate=False):
+    def train_on_batch(self, batch, epoch, validate=False, log=True):
         """
         Training on a single batch of data.
 
@@ -547,6 +547,9 @@ class BCQ(PolicyAlgo, ValueAlgo):
 
             validate (bool): if True, don't perform any learning updates.
 
+            log (bool): if False, the returned info will not be used for logging, so
+                outputs that are only needed for logging can be skipped.
+
         Returns:
             info (dict): dictionary of relevant inputs, outputs, and losses
                 that might be relevant for logging
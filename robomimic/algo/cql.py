@@ -8,6 +8,7 @@ from collections import OrderedDict
 
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 import torch.optim as optim
 
 import robomimic.models.base_nets as BaseNets
@@ -56,7 +57,7 @@ class CQL(PolicyAlgo, ValueAlgo):
         self._num_batch_steps = 0
         self.bc_start_steps = self.algo_config.actor.bc_start_steps
         self.deterministic_backup = self.algo_config.critic.deterministic_backup
-        self.td_loss_fcn = nn.SmoothL1Loss() if self.algo_config.critic.use_huber else nn.MSELoss()
+        self.td_loss_fcn = F.smooth_l1_loss if self.algo_config.critic.use_huber else F.mse_loss
 
         # Entropy settings
         self.target_entropy = -np.prod(self.ac_dim) if self.algo_config.actor.target_entropy in {None, "default"} else\
@@ -69,12 +70,12 @@ class CQL(PolicyAlgo, ValueAlgo):
     @property
     def log_entropy_weight(self):
         return self.nets["log_entropy_weight"]() if self.automatic_entropy_tuning else\
-            torch.zeros(1, requires_grad=False, device=self.device)
+            self._fixed_log_entropy_weight
 
     @property
     def log_cql_weight(self):
         return self.nets["log_cql_weight"]() if self.automatic_cql_tuning else\
-            torch.log(torch.tensor(self.algo_config.critic.cql_weight, requires_grad=False, device=self.device))
+            self._fixed_log_cql_weight
 
     def _create_networks(self):
         """
@@ -132,6 +133,14 @@ class CQL(PolicyAlgo, ValueAlgo):
         if self.automatic_cql_tuning:
             self.nets["log_cql_weight"] = BaseNets.Parameter(torch.zeros(1))
 
+        # Fixed weights (if not automatically tuning) are constants, so create them once on the
+        # device instead of allocating them every time they are accessed
+        if not self.automatic_entropy_tuning:
+            self._fixed_log_entropy_weight = torch.zeros(1, requires_grad=False, device=self.device)
+        if not self.automatic_cql_tuning:
+            self._fixed_log_cql_weight = torch.log(
+                torch.tensor(self.algo_config.critic.cql_weight, requires_grad=False, device=self.device))
+
         # Send networks to appropriate device
         self.nets = self.nets.float().to(self.device)
 
@@ -201,7 +210,7 @@ class CQL(PolicyAlgo, ValueAlgo):
 
         # single timestep reward is discounted sum of intermediate rewards in sequence
         reward_seq = batch["rewards"][:, :self.n_step]
-        discounts = torch.pow(self.algo_config.discount, torch.arange(self.n_step).float()).unsqueeze(0)
+        discounts = TorchUtils.n_step_discounts(self.algo_config.discount, self.n_step)
         input_batch["rewards"] = (reward_seq * discounts).sum(dim=1).unsqueeze(1)
 
         # consider this n-step seqeunce done if any intermediate dones are present
@@ -210,9 +219,9 @@ class CQL(PolicyAlgo, ValueAlgo):
 
         # we move to device first before float conversion because image observation modalities will be uint8 -
         # this minimizes the amount of data transferred to GPU
-        return TensorUtils.to_float(TensorUtils.to_device(input_batch, self.device))
+        return TensorUtils.to_device_and_float(input_batch, self.device, non_blocking=True)
 
-    def train_on_batch(self, batch, epoch, validate=False):
+    def train_on_batch(self, batch, epoch, validate=False, log=True):
         """
         Training on a single batch of data.
 
@@ -225,6 +234,9 @@ class CQL(PolicyAlgo, ValueAlgo):
 
             validate (bool): if True, don't perform any learning updates.
 
+            log (bool): if False, the returned info will not be used for logging, so
+                outputs that are only needed for logging can be skipped.
+
         Returns:
             info (dict): dictionary of relevant inputs, outputs, and losses
                 that might be relevant for logging
@@ -314,10 +326,11 @@ class CQL(PolicyAlgo, ValueAlgo):
             self._num_batch_steps += 1
             if self.automatic_entropy_tuning:
                 # Alpha
-                self.optimizers["entropy"].zero_grad()
-                entropy_weight_loss.backward()
-                self.optimizers["entropy"].step()
-                info["entropy_grad_norms"] = self.log_entropy_weight.grad.data.norm(2).pow(2).item()
+                info["entropy_grad_norms"] = TorchUtils.backprop_for_loss(
+                    net=self.nets["log_entropy_weight"],
+                    optim=self.optimizers["entropy"],
+                    loss=entropy_weight_loss,
+                )
 
             # Policy
             actor_grad_norms = TorchUtils.backprop_for_loss(
@@ -463,10 +476,12 @@ class CQL(PolicyAlgo, ValueAlgo):
                 cql_weight_loss = -torch.stack(cql_losses).mean()
                 info[
                     "critic/cql_weight_loss"] = cql_weight_loss.item()  # Make sure to not store computation graph since we retain graph after backward() call
-                self.optimizers["cql"].zero_grad()
-                cql_weight_loss.backward(retain_graph=True)
-                self.optimizers["cql"].step()
-                info["critic/cql_grad_norms"] = self.log_cql_weight.grad.data.norm(2).pow(2).item()
+                info["critic/cql_grad_norms"] = TorchUtils.backprop_for_loss(
+                    net=self.nets["log_cql_weight"],
+                    optim=self.optimizers["cql"],
+                    loss=cql_weight_loss,
+                    retain_graph=True,
+                )
 
             # Train critics
             for i, (critic_loss, critic, critic_target, optimizer) in enumerate(zip(
@@ -7,6 +7,7 @@ from copy import deepcopy
 
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 
 import robomimic.models.obs_nets as ObsNets
 import robomimic.models.vae_nets as VAENets
@@ -119,7 +120,7 @@ class GL(PlannerAlgo):
 
         # we move to device first before float conversion because image observation modalities will be uint8 -
         # this minimizes the amount of data transferred to GPU
-        return TensorUtils.to_float(TensorUtils.to_device(input_batch, self.device))
+        return TensorUtils.to_device_and_float(input_batch, self.device, non_blocking=True)
 
     def get_actor_goal_for_training_from_processed_batch(self, processed_batch, **kwargs):
         """
@@ -134,7 +135,7 @@ class GL(PlannerAlgo):
         """
         return processed_batch["target_subgoals"]
 
-    def train_on_batch(self, batch, epoch, validate=False):
+    def train_on_batch(self, batch, epoch, validate=False, log=True):
         """
         Training on a single batch of data.
 
@@ -147,6 +148,9 @@ class GL(PlannerAlgo):
 
             validate (bool): if True, don't perform any learning updates.
 
+            log (bool): if False, the returned info will not be used for logging, so
+                outputs that are only needed for logging can be skipped.
+
         Returns:
             info (dict): dictionary of relevant inputs, outputs, and losses
                 that might be relevant for logging
@@ -163,7 +167,7 @@ class GL(PlannerAlgo):
             goal_loss = 0.
             for k in pred_subgoals:
                 assert pred_subgoals[k].shape == target_subgoals[k].shape, "mismatch in predicted and target subgoals!"
-                mode_loss = nn.MSELoss()(pred_subgoals[k], target_subgoals[k])
+                mode_loss = F.mse_loss(pred_subgoals[k], target_subgoals[k])
                 goal_loss += mode_loss
                 losses["goal_{}_loss".format(k)] = mode_loss
             losses["goal_loss"] = goal_loss
@@ -353,20 +357,19 @@ class GL_VAE(GL):
                 # reshape prior samples to (batch_size, num_samples, latent_dim)
                 prior_z_samples = prior_z_samples.reshape(batch_size, num_prior_samples, -1)
 
-                # reshape posterior latents to (batch_size, 1, latent_dim)
-                posterior_z_expanded = posterior_z.unsqueeze(1)
-
-                # compute distances with broadcasting so that each posterior sample
-                # has distances to all of its prior samples
-                distances = (prior_z_samples - posterior_z_expanded).pow(2).sum(dim=2)
+                # compute squared distances from each posterior sample to all of its prior samples using
+                # ||p - q||^2 = ||p||^2 - 2 p.q + ||q||^2, which avoids materializing the pairwise differences.
+                # The ||q||^2 term is the same for all prior samples of a posterior sample q, so it does not
+                # change the closest prior sample and is dropped.
+                distances = prior_z_samples.pow(2).sum(dim=2) - 2. * torch.bmm(prior_z_samples, posterior_z.unsqueeze(2)).squeeze(2)
 
                 # then gather the closest prior sample for each posterior sample
                 neighbors = torch.argmin(distances, dim=1)
-                latent_subgoals = prior_z_samples[torch.arange(batch_size).long(), neighbors]
+                latent_subgoals = prior_z_samples[torch.arange(batch_size, device=prior_z_samples.device), neighbors]
 
         return { "latent_subgoal" : latent_subgoals }
 
-    def train_on_batch(self, batch, epoch, validate=False):
+    def train_on_batch(self, batch, epoch, validate=False, log=True):
         """
         Training on a single batch of data.
 
@@ -379,6 +382,9 @@ class GL_VAE(GL):
 
             validate (bool): if True, don't perform any learning updates.
 
+            log (bool): if False, the returned info will not be used for logging, so
+                outputs that are only needed for logging can be skipped.
+
         Returns:
             info (dict): dictionary of relevant inputs, outputs, and losses
                 that might be relevant for logging
@@ -582,9 +588,9 @@ class ValuePlanner(PlannerAlgo, ValueAlgo):
 
         # we move to device first before float conversion because image observation modalities will be uint8 -
         # this minimizes the amount of data transferred to GPU
-        return TensorUtils.to_float(TensorUtils.to_device(input_batch, self.device))
+        return TensorUtils.to_device_and_float(input_batch, self.device, non_blocking=True)
 
-    def train_on_batch(self, batch, epoch, validate=False):
+    def train_on_batch(self, batch, epoch, validate=False, log=True):
         """
         Training on a single batch of data.
 
@@ -597,6 +603,9 @@ class ValuePlanner(PlannerAlgo, ValueAlgo):
 
             validate (bool): if True, don't perform any learning updates.
 
+            log (bool): if False, the returned info will not be used for logging, so
+                outputs that are only needed for logging can be skipped.
+
         Returns:
             info (dict): dictionary of relevant inputs, outputs, and losses
                 that might be relevant for logging
@@ -608,10 +617,10 @@ class ValuePlanner(PlannerAlgo, ValueAlgo):
         info = dict(planner=dict(), value_net=dict())
 
         # train planner
-        info["planner"].update(self.planner.train_on_batch(batch["planner"], epoch, validate=validate))
+        info["planner"].update(self.planner.train_on_batch(batch["planner"], epoch, validate=validate, log=log))
 
         # train value network
-        info["value_net"].update(self.value_net.train_on_batch(batch["value_net"], epoch, validate=validate))
+        info["value_net"].update(self.value_net.train_on_batch(batch["value_net"], epoch, validate=validate, log=log))
 
         return info
 
@@ -147,9 +147,10 @@ class HBC(HierarchicalAlgo):
         if self.algo_config.actor_use_random_subgoals:
             # optionally use randomly sampled step between [1, seq_length] as policy goal
             policy_subgoal_indices = torch.randint(
-                low=0, high=self.global_config.train.seq_length, size=(batch["actions"].shape[0],))
+                low=0, high=self.global_config.train.seq_length, size=(batch["actions"].shape[0],),
+                device=batch["actions"].device)
             goal_obs = TensorUtils.gather_sequence(batch["next_obs"], policy_subgoal_indices)
-            goal_obs = TensorUtils.to_float(TensorUtils.to_device(goal_obs, self.device))
+            goal_obs = TensorUtils.to_device_and_float(goal_obs, self.device, non_blocking=True)
             input_batch["actor"]["goal_obs"] = \
                 self.planner.get_actor_goal_for_training_from_processed_batch(
                     goal_obs,
@@ -169,9 +170,9 @@ class HBC(HierarchicalAlgo):
 
         # we move to device first before float conversion because image observation modalities will be uint8 -
         # this minimizes the amount of data transferred to GPU
-        return TensorUtils.to_float(TensorUtils.to_device(input_batch, self.device))
+        return TensorUtils.to_device_and_float(input_batch, self.device, non_blocking=True)
 
-    def train_on_batch(self, batch, epoch, validate=False):
+    def train_on_batch(self, batch, epoch, validate=False, log=True):
         """
         Training on a single batch of data.
 
@@ -184,18 +185,21 @@ class HBC(HierarchicalAlgo):
 
             validate (bool): if True, don't perform any learning updates.
 
+            log (bool): if False, the returned info will not be used for logging, so
+                outputs that are only needed for logging can be skipped.
+
         Returns:
             info (dict): dictionary of relevant inputs, outputs, and losses
                 that might be relevant for logging
         """
         info = dict(planner=dict(), actor=dict())
         # train planner
-        info["planner"].update(self.planner.train_on_batch(batch["planner"], epoch, validate=validate))
+        info["planner"].update(self.planner.train_on_batch(batch["planner"], epoch, validate=validate, log=log))
 
         # train actor
         if self._algo_mode == "separate":
             # train low-level actor by getting subgoals from the dataset
-            info["actor"].update(self.actor.train_on_batch(batch["actor"], epoch, validate=validate))
+            info["actor"].update(self.actor.train_on_batch(batch["actor"], epoch, validate=validate, log=log))
 
         elif self._algo_mode == "cascade":
             # get predictions from the planner
@@ -204,7 +208,7 @@ class HBC(HierarchicalAlgo):
                     obs_dict=batch["planner"]["obs"], goal_dict=batch["planner"]["goal_obs"])
 
             # train actor with the predicted goal
-            info["actor"].update(self.actor.train_on_batch(batch["actor"], epoch, validate=validate))
+            info["actor"].update(self.actor.train_on_batch(batch["actor"], epoch, validate=validate, log=log))
 
         else:
             raise NotImplementedError("algo mode {} is not implemented".format(self._algo_mode))
@@ -126,9 +126,9 @@ class IQL(PolicyAlgo, ValueAlgo):
         input_batch["dones"] = batch["dones"][:, 0]
         input_batch["rewards"] = batch["rewards"][:, 0]
 
-        return TensorUtils.to_device(TensorUtils.to_float(input_batch), self.device)
+        return TensorUtils.to_device_and_float(input_batch, self.device, non_blocking=True)
 
-    def train_on_batch(self, batch, epoch, validate=False):
+    def train_on_batch(self, batch, epoch, validate=False, log=True):
         """
         Training on a single batch of data.
 
@@ -141,6 +141,9 @@ class IQL(PolicyAlgo, ValueAlgo):
 
             validate (bool): if True, don't perform any learning updates.
 
+            log (bool): if False, the returned info will not be used for logging, so
+                outputs that are only needed for logging can be skipped.
+
         Returns:
             info (dict): dictionary of relevant inputs, outputs, and losses
                 that might be relevant for logging
@@ -207,7 +210,7 @@ class IQL(PolicyAlgo, ValueAlgo):
 
         # Q losses
         critic_losses = []
-        td_loss_fcn = nn.SmoothL1Loss() if self.algo_config.critic.use_huber else nn.MSELoss()
+        td_loss_fcn = F.smooth_l1_loss if self.algo_config.critic.use_huber else F.mse_loss
         for (i, q_pred) in enumerate(pred_qs):
             # Calculate td error loss
             td_loss = td_loss_fcn(q_pred, q_target)
@@ -365,36 +368,38 @@ class IQL(PolicyAlgo, ValueAlgo):
         Returns:
             loss_log (dict): name -> summary statistic
         """
-        log = OrderedDict()
+        # gather all scalar statistics first, so that they are transferred to the host with a
+        # single synchronization instead of one .item() call each
+        scalars = OrderedDict()
 
-        log["actor/log_prob"] = info["actor/log_prob"].item()
-        log["actor/loss"] = info["actor/loss"].item()
+        scalars["actor/log_prob"] = info["actor/log_prob"]
+        scalars["actor/loss"] = info["actor/loss"]
 
-        log["critic/critic1_pred"] = info["critic/critic1_pred"].item()
-        log["critic/critic1_loss"] = info["critic/critic1_loss"].item()
+        scalars["critic/critic1_pred"] = info["critic/critic1_pred"]
+        scalars["critic/critic1_loss"] = info["critic/critic1_loss"]
 
-        log["vf/v_loss"] = info["vf/v_loss"].item()
+        scalars["vf/v_loss"] = info["vf/v_loss"]
 
-        self._log_data_attributes(log, info, "vf/q_pred")
-        self._log_data_attributes(log, info, "vf/v_pred")
-        self._log_data_attributes(log, info, "adv/adv")
-        self._log_data_attributes(log, info, "adv/adv_weight")
+        self._log_data_attributes(scalars, info, "vf/q_pred")
+        self._log_data_attributes(scalars, info, "vf/v_pred")
+        self._log_data_attributes(scalars, info, "adv/adv")
+        self._log_data_attributes(scalars, info, "adv/adv_weight")
 
-        return log
+        return TensorUtils.scalars_to_floats(scalars)
 
     def _log_data_attributes(self, log, info, key):
         """
         Helper function for logging statistics. Moodifies log in-place
 
         Args:
-            log (dict): existing log dictionary
+            log (dict): existing log dictionary of scalar tensors
             log (dict): existing dictionary of tensors containing raw stats
             key (str): key to log
         """
-        log[key + "/max"] = info[key].max().item()
-        log[key + "/min"] = info[key].min().item()
-        log[key + "/mean"] = info[key].mean().item()
-        log[key + "/std"] = info[key].std().item()
+        log[key + "/max"] = info[key].max()
+        log[key + "/min"] = info[key].min()
+        log[key + "/mean"] = info[key].mean()
+        log[key + "/std"] = info[key].std()
 
     def on_epoch_end(self, epoch):
         """
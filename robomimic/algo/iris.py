@@ -143,9 +143,10 @@ class IRIS(HBC, ValueAlgo):
         if self.algo_config.actor_use_random_subgoals:
             # optionally use randomly sampled step between [1, seq_length] as policy goal
             policy_subgoal_indices = torch.randint(
-                low=0, high=self.global_config.train.seq_length, size=(batch["actions"].shape[0],))
+                low=0, high=self.global_config.train.seq_length, size=(batch["actions"].shape[0],),
+                device=batch["actions"].device)
             goal_obs = TensorUtils.gather_sequence(batch["next_obs"], policy_subgoal_indices)
-            goal_obs = TensorUtils.to_float(TensorUtils.to_device(goal_obs, self.device))
+            goal_obs = TensorUtils.to_device_and_float(goal_obs, self.device, non_blocking=True)
             input_batch["actor"]["goal_obs"] = goal_obs
         else:
             # otherwise, use planner subgoal target as goal for the policy
@@ -153,7 +154,7 @@ class IRIS(HBC, ValueAlgo):
 
         # we move to device first before float conversion because image observation modalities will be uint8 -
         # this minimizes the amount of data transferred to GPU
-        return TensorUtils.to_float(TensorUtils.to_device(input_batch, self.device))
+        return TensorUtils.to_device_and_float(input_batch, self.device, non_blocking=True)
 
     def get_state_value(self, obs_dict, goal_dict=None):
         """
@@ -172,7 +172,7 @@ class TD3_BC(PolicyAlgo, ValueAlgo):
 
         # single timestep reward is discounted sum of intermediate rewards in sequence
         reward_seq = batch["rewards"][:, :n_step]
-        discounts = torch.pow(self.algo_config.discount, torch.arange(n_step).float()).unsqueeze(0)
+        discounts = TorchUtils.n_step_discounts(self.algo_config.discount, n_step)
         input_batch["rewards"] = (reward_seq * discounts).sum(dim=1).unsqueeze(1)
 
         # discount rate will be gamma^N for computing n-step returns
@@ -184,14 +184,14 @@ class TD3_BC(PolicyAlgo, ValueAlgo):
         input_batch["dones"] = (done_seq.sum(dim=1) > 0).float().unsqueeze(1)
 
         if self.algo_config.infinite_horizon:
-            # scale terminal rewards by 1 / (1 - gamma) for infinite horizon MDPs
-            done_inds = input_batch["dones"].round().long().nonzero(as_tuple=False)[:, 0]
-            if done_inds.shape[0] > 0:
-                input_batch["rewards"][done_inds] = input_batch["rewards"][done_inds] * (1. / (1. - self.discount))
+            # scale terminal rewards by 1 / (1 - gamma) for infinite horizon MDPs, using a mask
+            # instead of gathering and scattering the terminal indices
+            rewards = input_batch["rewards"]
+            input_batch["rewards"] = torch.where(input_batch["dones"] > 0.5, rewards * (1. / (1. - self.discount)), rewards)
 
         # we move to device first before float conversion because image observation modalities will be uint8 -
         # this minimizes the amount of data transferred to GPU
-        return TensorUtils.to_float(TensorUtils.to_device(input_batch, self.device))
+        return TensorUtils.to_device_and_float(input_batch, self.device, non_blocking=True)
 
     def _train_critic_on_batch(self, batch, epoch, no_backprop=False):
         """
@@ -288,7 +288,7 @@ class TD3_BC(PolicyAlgo, ValueAlgo):
         actor_actions = self.nets["actor"](s_batch, goal_s_batch)
         Q_values = self.nets["critic"][0](s_batch, actor_actions, goal_s_batch)
         lam = self.algo_config.alpha / Q_values.abs().mean().detach()
-        actor_loss = -lam * Q_values.mean() + nn.MSELoss()(actor_actions, a_batch)
+        actor_loss = -lam * Q_values.mean() + F.mse_loss(actor_actions, a_batch)
         info["actor/loss"] = actor_loss
 
         if not no_backprop:
@@ -318,10 +318,10 @@ class TD3_BC(PolicyAlgo, ValueAlgo):
         with torch.no_grad():
             # get next actions via target actor and noise
             next_target_actions = self.nets["actor_target"](next_states, goal_states)
-            noise = (
-                torch.randn_like(next_target_actions) * self.algo_config.actor.noise_std
-            ).clamp(-self.algo_config.actor.noise_clip, self.algo_config.actor.noise_clip)
-            next_actions = (next_target_actions + noise).clamp(-1.0, 1.0)
+            # (no gradients are needed here, so intermediate results are updated in-place)
+            noise = torch.randn_like(next_target_actions).mul_(self.algo_config.actor.noise_std).clamp_(
+                -self.algo_config.actor.noise_clip, self.algo_config.actor.noise_clip)
+            next_actions = noise.add_(next_target_actions).clamp_(-1.0, 1.0)
 
             # TD3 trick to combine max and min over all Q-ensemble estimates into single target estimates
             all_value_targets = self.nets["critic_target"][0](next_states, next_actions, goal_states).reshape(-1, 1)
@@ -355,12 +355,12 @@ class TD3_BC(PolicyAlgo, ValueAlgo):
         """
         q_estimated = critic(states, actions, goal_states)
         if self.algo_config.critic.use_huber:
-            critic_loss = nn.SmoothL1Loss()(q_estimated, q_targets)
+            critic_loss = F.smooth_l1_loss(q_estimated, q_targets)
         else:
-            critic_loss = nn.MSELoss()(q_estimated, q_targets)
+            critic_loss = F.mse_loss(q_estimated, q_targets)
         return critic_loss
 
-    def train_on_batch(self, batch, epoch, validate=False):
+    def train_on_batch(self, batch, epoch, validate=False, log=True):
         """
         Training on a single batch of data.
 
@@ -373,6 +373,9 @@ class TD3_BC(PolicyAlgo, ValueAlgo):
 
             validate (bool): if True, don't perform any learning updates.
 
+            log (bool): if False, the returned info will not be used for logging, so
+                outputs that are only needed for logging can be skipped.
+
         Returns:
             info (dict): dictionary of relevant inputs, outputs, and losses
                 that might be relevant for logging
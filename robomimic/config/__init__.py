@@ -1,12 +1,30 @@
+import importlib
+
 from robomimic.config.config import Config
-from robomimic.config.base_config import config_factory, get_all_registered_configs
-
-# note: these imports are needed to register these classes in the global config registry
-from robomimic.config.bc_config import BCConfig
-from robomimic.config.bcq_config import BCQConfig
-from robomimic.config.cql_config import CQLConfig
-from robomimic.config.iql_config import IQLConfig
-from robomimic.config.gl_config import GLConfig
-from robomimic.config.hbc_config import HBCConfig
-from robomimic.config.iris_config import IRISConfig
-from robomimic.config.td3_bc_config import TD3_BCConfig
\ No newline at end of file
+from robomimic.config.base_config import config_factory, get_all_registered_configs, CONFIG_MODULES
+
+# note: config classes are imported lazily on first attribute access (PEP 562), so that importing
+# this package does not parse every config module. The global config registry imports the module
+# for an algo (see @CONFIG_MODULES) the first time its config is requested.
+LAZY_CONFIG_CLASSES = {
+    "BCConfig": "robomimic.config.bc_config",
+    "BCQConfig": "robomimic.config.bcq_config",
+    "CQLConfig": "robomimic.config.cql_config",
+    "IQLConfig": "robomimic.config.iql_config",
+    "GLConfig": "robomimic.config.gl_config",
+    "HBCConfig": "robomimic.config.hbc_config",
+    "IRISConfig": "robomimic.config.iris_config",
+    "TD3_BCConfig": "robomimic.config.td3_bc_config",
+}
+
+
+def __getattr__(name):
+    if name in LAZY_CONFIG_CLASSES:
+        val = getattr(importlib.import_module(LAZY_CONFIG_CLASSES[name]), name)
+        globals()[name] = val
+        return val
+    raise AttributeError("module {} has no attribute {}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(LAZY_CONFIG_CLASSES))
@@ -4,8 +4,12 @@ Subclasses get registered into a global dictionary, making it easy to instantiat
 the correct config class given the algorithm name.
 """
 
+import sys
 import six # preserve metaclass compatibility between python 2 and 3
+import importlib
+import functools
 from copy import deepcopy
+from collections import OrderedDict
 
 import robomimic
 from robomimic.config.config import Config
@@ -13,12 +17,38 @@ from robomimic.config.config import Config
 # global dictionary for remembering name - class mappings
 REGISTERED_CONFIGS = {}
 
+# static mapping from algo name to the module that defines its config class, so that
+# looking up a config only needs to import the module that defines it
+CONFIG_MODULES = OrderedDict([
+    ("bc", "robomimic.config.bc_config"),
+    ("bcq", "robomimic.config.bcq_config"),
+    ("cql", "robomimic.config.cql_config"),
+    ("iql", "robomimic.config.iql_config"),
+    ("gl", "robomimic.config.gl_config"),
+    ("hbc", "robomimic.config.hbc_config"),
+    ("iris", "robomimic.config.iris_config"),
+    ("td3_bc", "robomimic.config.td3_bc_config"),
+])
+
+
+def register_all_configs():
+    """
+    Imports every config module so that their config classes are registered.
+    Config modules are imported lazily by the @robomimic.config package, so this is
+    called when all configs are needed, or when an algo name that is not in
+    @CONFIG_MODULES is requested.
+    """
+    for module_name in CONFIG_MODULES.values():
+        importlib.import_module(module_name)
+
 
 def get_all_registered_configs():
     """
     Give access to dictionary of all registered configs for external use.
     """
-    return deepcopy(REGISTERED_CONFIGS)
+    register_all_configs()
+    # the values are classes, which deepcopy would return as-is, so a shallow copy is equivalent
+    return dict(REGISTERED_CONFIGS)
 
 
 def config_factory(algo_name, dic=None):
@@ -26,10 +56,29 @@ def config_factory(algo_name, dic=None):
     Creates an instance of a config from the algo name. Optionally pass
     a dictionary to instantiate the config from the dictionary.
     """
+    algo_name = sys.intern(algo_name)
+    if algo_name not in REGISTERED_CONFIGS:
+        if algo_name in CONFIG_MODULES:
+            importlib.import_module(CONFIG_MODULES[algo_name])
+        else:
+            register_all_configs()
     if algo_name not in REGISTERED_CONFIGS:
         raise Exception("Config for algo name {} not found. Make sure it is a registered config among: {}".format(
             algo_name, ', '.join(REGISTERED_CONFIGS)))
-    return REGISTERED_CONFIGS[algo_name](dict_to_load=dic)
+    if dic is not None:
+        return REGISTERED_CONFIGS[algo_name](dict_to_load=dic)
+    # default configs are built once per algo name and copied on return, since callers
+    # are free to modify the config they receive
+    return _default_config(algo_name).clone()
+
+
+@functools.lru_cache(maxsize=32)
+def _default_config(algo_name):
+    """
+    Builds the default config for the algo name. Results are cached, and the cache is
+    invalidated whenever a new config class is registered.
+    """
+    return REGISTERED_CONFIGS[algo_name]()
 
 
 class ConfigMeta(type):
@@ -40,7 +89,9 @@ class ConfigMeta(type):
     def __new__(meta, name, bases, class_dict):
         cls = super(ConfigMeta, meta).__new__(meta, name, bases, class_dict)
         if cls.__name__ != "BaseConfig":
-            REGISTERED_CONFIGS[cls.ALGO_NAME] = cls
+            # intern registry keys so that lookups with interned names can match on identity
+            REGISTERED_CONFIGS[sys.intern(cls.ALGO_NAME)] = cls
+            _default_config.cache_clear()
         return cls
 
 
@@ -87,6 +138,7 @@ class BaseConfig(Config):
         self.experiment.logging.log_tb = True                       # enable tensorboard logging
         self.experiment.logging.log_wandb = False                   # enable wandb logging
         self.experiment.logging.wandb_proj_name = "debug"           # project name if using wandb
+        self.experiment.logging.log_every_n_steps = 1               # only log training metrics every n gradient steps (logged metrics are averaged over these steps)
 
 
         ## save config - if and when to save model checkpoints ##
@@ -146,6 +198,15 @@ class BaseConfig(Config):
         # num workers for loading data - generally set to 0 for low-dim datasets, and 2 for image datasets
         self.train.num_data_workers = 0  
 
+        # number of batches each data worker loads ahead of time (only used if @num_data_workers > 0)
+        self.train.prefetch_factor = 4
+
+        # if true, copy each batch to the GPU on a separate CUDA stream one step ahead of training, so that
+        # host-to-device copies overlap with computation. Note that batches are copied in full, before
+        # the algorithm filters them in @process_batch_for_training, so this helps most when algorithms
+        # use most of each batch (e.g. not for subgoal-based algorithms that fetch long next_obs sequences)
+        self.train.prefetch_to_device = False
+
         # One of ["all", "low_dim", or None]. Set to "all" to cache entire hdf5 in memory - this is 
         # by far the fastest for data loading. Set to "low_dim" to cache all non-image data. Set
         # to None to use no caching - in this case, every batch sample is retrieved via file i/o.
@@ -192,7 +253,12 @@ class BaseConfig(Config):
 
         ## learning config ##
         self.train.cuda = True          # use GPU or not
-        self.train.batch_size = 100     # batch size
+        self.train.channels_last = False    # use channels_last memory format for conv nets and image observations (supported algos only)
+        self.train.mixed_precision = None   # one of [None, "bf16", "fp16"] - run forward passes under autocast (supported algos only)
+        self.train.allow_tf32 = False       # allow TF32 tensor cores for float32 matmuls (Ampere and newer GPUs) - if False, torch defaults are left unchanged
+        self.train.cuda_expandable_segments = False     # let the CUDA caching allocator grow memory segments in-place to reduce fragmentation (requires torch >= 2.1)
+        self.train.compile = False          # compile policy forward passes (training and rollouts) with torch.compile (supported algos only, requires torch >= 2.0)
+        self.train.batch_size = 100     # batch size (per process in multi-GPU training, so the effective batch size is multiplied by the number of processes)
         self.train.num_epochs = 2000    # number of training epochs
         self.train.seed = 1             # seed for training (for reproducibility)
 
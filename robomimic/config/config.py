@@ -260,6 +260,35 @@ class Config(dict):
     def deepcopy(self):
         return copy.deepcopy(self)
 
+    def clone(self):
+        """
+        Returns a deep copy of this config that keeps the class of this config and the
+        lock state of every nested config. Unlike @deepcopy, this does not call the
+        constructor of the config class, and only walks the nested config structure once.
+
+        Returns:
+            config (Config): a copy of this config
+        """
+        other = Config.__new__(type(self))
+        for name in ('__key_locked', '__all_locked', '__do_not_lock_keys'):
+            object.__setattr__(other, name, object.__getattribute__(self, name))
+        object.__setattr__(other, '__parent', None)
+        object.__setattr__(other, '__key', None)
+        for key, value in self.items():
+            dict.__setitem__(other, key, Config._clone_item(value))
+        return other
+
+    @classmethod
+    def _clone_item(cls, item):
+        if isinstance(item, Config):
+            return item.clone()
+        elif isinstance(item, (list, tuple)):
+            return type(item)(Config._clone_item(elem) for elem in item)
+        elif item is None or isinstance(item, (str, int, float)):
+            # immutable leaves can be shared, which avoids a deepcopy call per leaf
+            return item
+        return copy.deepcopy(item)
+
     def __deepcopy__(self, memo):
         other = self.__class__()
         memo[id(self)] = other
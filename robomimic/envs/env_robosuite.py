@@ -105,6 +105,9 @@ class EnvRobosuite(EB.EnvBase):
                 if ("joint_pos" in ob_name) or ("eef_vel" in ob_name):
                     self.env.modify_observable(observable_name=ob_name, attribute="active", modifier=True)
 
+        # cached grouping of raw observation keys (see @_get_obs_key_groups)
+        self._obs_key_groups = None
+
     def step(self, action):
         """
         Step in the environment with an action.
@@ -206,14 +209,15 @@ class EnvRobosuite(EB.EnvBase):
         """
         if di is None:
             di = self.env._get_observations(force_update=True) if self._is_v1 else self.env._get_observation()
+        visual_keys, robot_keys = self._get_obs_key_groups(di)
         ret = {}
-        for k in di:
-            if (k in ObsUtils.OBS_KEYS_TO_MODALITIES) and ObsUtils.key_is_obs_modality(key=k, obs_modality="rgb"):
+        for k, obs_modality in visual_keys:
+            if obs_modality == "rgb":
                 # by default images from mujoco are flipped in height
                 ret[k] = di[k][::-1]
                 if self.postprocess_visual_obs:
                     ret[k] = ObsUtils.process_obs(obs=ret[k], obs_key=k)
-            elif (k in ObsUtils.OBS_KEYS_TO_MODALITIES) and ObsUtils.key_is_obs_modality(key=k, obs_modality="depth"):
+            else:
                 # by default depth images from mujoco are flipped in height
                 ret[k] = di[k][::-1]
                 if len(ret[k].shape) == 2:
@@ -228,14 +232,9 @@ class EnvRobosuite(EB.EnvBase):
         ret["object"] = np.array(di["object-state"])
 
         if self._is_v1:
-            for robot in self.env.robots:
-                # add all robot-arm-specific observations. Note the (k not in ret) check
-                # ensures that we don't accidentally add robot wrist images a second time
-                pf = robot.robot_model.naming_prefix
-                for k in di:
-                    if k.startswith(pf) and (k not in ret) and \
-                            (not k.endswith("proprio-state")):
-                        ret[k] = np.array(di[k])
+            # add all robot-arm-specific observations
+            for k in robot_keys:
+                ret[k] = np.array(di[k])
         else:
             # minimal proprioception for older versions of robosuite
             ret["proprio"] = np.array(di["robot-state"])
@@ -244,18 +243,63 @@ class EnvRobosuite(EB.EnvBase):
             ret["gripper_qpos"] = np.array(di["gripper_qpos"])
         return ret
 
+    def _get_obs_key_groups(self, di):
+        """
+        Sorts the keys of a raw robosuite observation dictionary into the rgb / depth image keys
+        and the robot-specific keys used by @get_observation. The raw observation keys are the
+        same at every step, so the grouping is cached, and only recomputed if the keys or the
+        registered observation modalities change.
+
+        Args:
+            di (dict): raw observation dictionary from robosuite
+
+        Returns:
+            visual_keys (list): (key, modality) pairs for rgb and depth observations
+            robot_keys (list): robot-specific observation keys (only for robosuite v1)
+        """
+        cache_key = (tuple(di.keys()), id(ObsUtils.OBS_KEYS_TO_MODALITIES), len(ObsUtils.OBS_KEYS_TO_MODALITIES))
+        if (self._obs_key_groups is not None) and (self._obs_key_groups[0] == cache_key):
+            return self._obs_key_groups[1]
+
+        visual_keys = []
+        for k in di:
+            if (k in ObsUtils.OBS_KEYS_TO_MODALITIES) and ObsUtils.key_is_obs_modality(key=k, obs_modality="rgb"):
+                visual_keys.append((k, "rgb"))
+            elif (k in ObsUtils.OBS_KEYS_TO_MODALITIES) and ObsUtils.key_is_obs_modality(key=k, obs_modality="depth"):
+                visual_keys.append((k, "depth"))
+
+        robot_keys = []
+        if self._is_v1:
+            # Note the check against existing keys ensures that we don't accidentally add
+            # robot wrist images a second time
+            existing_keys = set(k for k, _ in visual_keys)
+            existing_keys.add("object")
+            for robot in self.env.robots:
+                pf = robot.robot_model.naming_prefix
+                for k in di:
+                    if k.startswith(pf) and (k not in existing_keys) and \
+                            (not k.endswith("proprio-state")):
+                        robot_keys.append(k)
+                        existing_keys.add(k)
+
+        self._obs_key_groups = (cache_key, (visual_keys, robot_keys))
+        return visual_keys, robot_keys
+
     def get_real_depth_map(self, depth_map):
         """
         Reproduced from https://github.com/ARISE-Initiative/robosuite/blob/c57e282553a4f42378f2635b9a3cbc4afba270fd/robosuite/utils/camera_utils.py#L106
         since older versions of robosuite do not have this conversion from normalized depth values returned by MuJoCo
         to real depth values.
         """
-        # Make sure that depth values are normalized
-        assert np.all(depth_map >= 0.0) and np.all(depth_map <= 1.0)
+        # Make sure that depth values are normalized (min / max avoid allocating boolean arrays)
+        assert (depth_map.min() >= 0.0) and (depth_map.max() <= 1.0)
         extent = self.env.sim.model.stat.extent
         far = self.env.sim.model.vis.map.zfar * extent
         near = self.env.sim.model.vis.map.znear * extent
-        return near / (1.0 - depth_map * (1.0 - near / far))
+        # compute near / (1 - depth * (1 - near / far)) with a single output array, updated in-place
+        real_depth_map = depth_map * (near / far - 1.0)
+        real_depth_map += 1.0
+        return np.divide(near, real_depth_map, out=real_depth_map)
 
     def get_camera_intrinsic_matrix(self, camera_name, camera_height, camera_width):
         """
@@ -1,11 +1,17 @@
 """
 Set of global variables shared across robomimic
 """
+import os
+import importlib.util
+
 # Sets debugging mode. Should be set at top-level script so that internal
-# debugging functionalities are made active
+# debugging functionalities are made active. Since scripts may toggle this after
+# import, read it through the module (Macros.DEBUG) instead of importing the name.
 DEBUG = False
 
-# Whether to visualize the before & after of an observation randomizer
+# Whether to visualize the before & after of an observation randomizer. This is only
+# read in hot paths, so consumers should bind it at import time with
+# `from robomimic.macros import VISUALIZE_RANDOMIZER` to make each read a single global lookup.
 VISUALIZE_RANDOMIZER = False
 
 # wandb entity (eg. username or team name)
@@ -15,13 +21,14 @@ WANDB_ENTITY = None
 # alternatively, set up wandb from terminal with `wandb login`
 WANDB_API_KEY = None
 
-try:
+# probe for the private macro file instead of catching ImportError, so that a missing file
+# is cheap to detect and genuine errors inside the private file are not swallowed
+if importlib.util.find_spec("robomimic.macros_private") is not None:
     from robomimic.macros_private import *
-except ImportError:
+else:
     from robomimic.utils.log_utils import log_warning
-    import robomimic
     log_warning(
         "No private macro file found!"\
         "\nIt is recommended to use a private macro file"\
-        "\nTo setup, run: python {}/scripts/setup_macros.py".format(robomimic.__path__[0])
+        "\nTo setup, run: python {}/scripts/setup_macros.py".format(os.path.dirname(__file__))
     )
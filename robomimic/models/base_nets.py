@@ -367,9 +367,9 @@ class RNN_Base(Module):
             hidden_state (torch.Tensor or tuple): returns hidden state tensor or tuple of hidden state tensors
                 depending on the RNN type
         """
-        h_0 = torch.zeros(self._num_layers * self._num_directions, batch_size, self._hidden_dim).to(device)
+        h_0 = torch.zeros(self._num_layers * self._num_directions, batch_size, self._hidden_dim, device=device)
         if self._rnn_type == "LSTM":
-            c_0 = torch.zeros(self._num_layers * self._num_directions, batch_size, self._hidden_dim).to(device)
+            c_0 = torch.zeros(self._num_layers * self._num_directions, batch_size, self._hidden_dim, device=device)
             return h_0, c_0
         else:
             return h_0
@@ -121,3 +121,27 @@ class DiscreteValueDistribution(object):
         """
         inds = self._categorical_dist.sample(sample_shape=sample_shape)
         return torch.gather(self.values, inds, dim=-1)
+
+
+def sample_gmm(means, scales, logits):
+    """
+    Draws a sample from each Gaussian mixture in a batch of mixtures. This is equivalent
+    to sampling from the corresponding D.MixtureSameFamily distribution, but only the
+    parameters of the sampled mode are gathered and perturbed, instead of drawing a
+    Gaussian sample for every mode and discarding all but one. Gradients do not pass
+    through the samples, like D.MixtureSameFamily.sample.
+
+    Args:
+        means (torch.Tensor): mode means of shape [..., num_modes, dim]
+        scales (torch.Tensor): mode standard deviations of shape [..., num_modes, dim]
+        logits (torch.Tensor): unnormalized mode logits of shape [..., num_modes]
+
+    Returns:
+        samples (torch.Tensor): samples of shape [..., dim]
+    """
+    with torch.no_grad():
+        modes = D.Categorical(logits=logits, validate_args=False).sample()
+        modes = modes[..., None, None].expand(*modes.shape, 1, means.shape[-1])
+        mean = means.gather(-2, modes).squeeze(-2)
+        scale = scales.gather(-2, modes).squeeze(-2)
+        return mean + scale * torch.randn_like(mean)
@@ -19,12 +19,31 @@ import robomimic.utils.tensor_utils as TensorUtils
 import robomimic.utils.obs_utils as ObsUtils
 from robomimic.utils.python_utils import extract_class_init_kwargs_from_dict
 
-# NOTE: this is required for the backbone classes to be found by the `eval` call in the core networks
+# NOTE: this is required for the backbone classes to be found by name in the core networks
 from robomimic.models.base_nets import *
 from robomimic.utils.vis_utils import visualize_image_randomizer
 from robomimic.macros import VISUALIZE_RANDOMIZER
 
 
+def _net_class_from_name(class_name):
+    """
+    Looks up a backbone or pooling network class by name among the classes available
+    in this module (which includes all classes in robomimic.models.base_nets). This is
+    used instead of calling eval on strings from the config.
+
+    Args:
+        class_name (str): name of network class
+
+    Returns:
+        cls (type): network class
+    """
+    assert isinstance(class_name, str)
+    cls = globals().get(class_name, None)
+    if not isinstance(cls, type):
+        raise KeyError("network class {} not found - it should be defined in or imported into {}".format(class_name, __name__))
+    return cls
+
+
 """
 ================================================
 Encoder Core Networks (Abstract class)
@@ -97,11 +116,11 @@ class VisualCore(EncoderCore, BaseNets.ConvBase):
         backbone_kwargs["input_channel"] = input_shape[0]
 
         # extract only relevant kwargs for this specific backbone
-        backbone_kwargs = extract_class_init_kwargs_from_dict(cls=eval(backbone_class), dic=backbone_kwargs, copy=True)
+        backbone_cls = _net_class_from_name(backbone_class)
+        backbone_kwargs = extract_class_init_kwargs_from_dict(cls=backbone_cls, dic=backbone_kwargs, copy=True)
 
         # visual backbone
-        assert isinstance(backbone_class, str)
-        self.backbone = eval(backbone_class)(**backbone_kwargs)
+        self.backbone = backbone_cls(**backbone_kwargs)
 
         assert isinstance(self.backbone, BaseNets.ConvBase)
 
@@ -110,14 +129,14 @@ class VisualCore(EncoderCore, BaseNets.ConvBase):
 
         # maybe make pool net
         if pool_class is not None:
-            assert isinstance(pool_class, str)
+            pool_cls = _net_class_from_name(pool_class)
             # feed output shape of backbone to pool net
             if pool_kwargs is None:
                 pool_kwargs = dict()
             # extract only relevant kwargs for this specific backbone
             pool_kwargs["input_shape"] = feat_shape
-            pool_kwargs = extract_class_init_kwargs_from_dict(cls=eval(pool_class), dic=pool_kwargs, copy=True)
-            self.pool = eval(pool_class)(**pool_kwargs)
+            pool_kwargs = extract_class_init_kwargs_from_dict(cls=pool_cls, dic=pool_kwargs, copy=True)
+            self.pool = pool_cls(**pool_kwargs)
             assert isinstance(self.pool, BaseNets.Module)
 
             feat_shape = self.pool.output_shape(feat_shape)
@@ -250,7 +269,7 @@ class ScanCore(EncoderCore, BaseNets.ConvBase):
             # Get output shape
             feat_shape = self.unsqueeze.output_shape(feat_shape)
             # Create pooling network
-            self.pool = eval(pool_class)(input_shape=feat_shape, **pool_kwargs)
+            self.pool = _net_class_from_name(pool_class)(input_shape=feat_shape, **pool_kwargs)
             net_list.append(self.pool)
             feat_shape = self.pool.output_shape(feat_shape)
         else:
@@ -760,7 +760,29 @@ class RNN_MIMO_MLP(Module):
         # returns a dictionary instead of list since outputs are dictionaries
         return { k : [T] + list(self.output_shapes[k]) for k in self.output_shapes }
 
-    def forward(self, rnn_init_state=None, return_state=False, **inputs):
+    def encode(self, **inputs):
+        """
+        Encodes observation groups into flat RNN inputs.
+
+        Args:
+            inputs (dict): a dictionary of dictionaries with one dictionary per
+                observation group, as in @forward. First two leading dimensions should
+                be batch and time [B, T, ...] for each tensor.
+
+        Returns:
+            rnn_inputs (torch.Tensor): flat RNN inputs of shape [B, T, D]
+        """
+        for obs_group in self.input_obs_group_shapes:
+            for k in self.input_obs_group_shapes[obs_group]:
+                # first two dimensions should be [B, T] for inputs
+                assert inputs[obs_group][k].ndim - 2 == len(self.input_obs_group_shapes[obs_group][k])
+
+        # use encoder to extract flat rnn inputs
+        rnn_inputs = TensorUtils.time_distributed(inputs, self.nets["encoder"], inputs_as_kwargs=True)
+        assert rnn_inputs.ndim == 3  # [B, T, D]
+        return rnn_inputs
+
+    def forward(self, rnn_init_state=None, return_state=False, rnn_inputs=None, **inputs):
         """
         Args:
             inputs (dict): a dictionary of dictionaries with one dictionary per
@@ -773,6 +795,9 @@ class RNN_MIMO_MLP(Module):
 
             return_state (bool): whether to return hidden state
 
+            rnn_inputs (torch.Tensor): if provided, pre-computed outputs of @encode for the
+                inputs, in which case @inputs are ignored and the encoder is not run
+
         Returns:
             outputs (dict): dictionary of output torch.Tensors, that corresponds
                 to @self.output_shapes. Leading dimensions will be batch and time [B, T, ...]
@@ -780,14 +805,8 @@ class RNN_MIMO_MLP(Module):
 
             rnn_state (torch.Tensor or tuple): return the new rnn state (if @return_state)
         """
-        for obs_group in self.input_obs_group_shapes:
-            for k in self.input_obs_group_shapes[obs_group]:
-                # first two dimensions should be [B, T] for inputs
-                assert inputs[obs_group][k].ndim - 2 == len(self.input_obs_group_shapes[obs_group][k])
-
-        # use encoder to extract flat rnn inputs
-        rnn_inputs = TensorUtils.time_distributed(inputs, self.nets["encoder"], inputs_as_kwargs=True)
-        assert rnn_inputs.ndim == 3  # [B, T, D]
+        if rnn_inputs is None:
+            rnn_inputs = self.encode(**inputs)
         if self.per_step:
             return self.nets["rnn"].forward(inputs=rnn_inputs, rnn_init_state=rnn_init_state, return_state=return_state)
         
@@ -996,7 +1015,8 @@ class MIMO_Transformer(Module):
             .unsqueeze(0)
             .repeat(embeddings.shape[0], 1)
         )
-        assert (timesteps >= 0.0).all(), "timesteps must be positive!"
+        # note: timesteps come from arange(0, T), so they are always non-negative - checking this with
+        # (timesteps >= 0).all() would force a device sync and prevent the forward pass from being exported
         if self.transformer_sinusoidal_embedding:
             assert torch.is_floating_point(timesteps), timesteps.dtype
         else:
@@ -1037,10 +1057,14 @@ class MIMO_Transformer(Module):
         return embeddings
 
     
-    def forward(self, **inputs):
+    def forward(self, last_step_only=False, **inputs):
         """
         Process each set of inputs in its own observation group.
         Args:
+            last_step_only (bool): if True, only decode the transformer output at the final
+                timestep, so that outputs have a temporal dimension of size 1. This avoids
+                running the decoder on timesteps whose outputs would be discarded.
+
             inputs (dict): a dictionary of dictionaries with one dictionary per
                 observation group. Each observation group's dictionary should map
                 modality to torch.Tensor batches. Should be consistent with
@@ -1072,6 +1096,8 @@ class MIMO_Transformer(Module):
             transformer_encoder_outputs = self.nets["transformer"].forward(transformer_embeddings)
 
         transformer_outputs = transformer_encoder_outputs
+        if last_step_only:
+            transformer_outputs = transformer_outputs[:, -1:]
         # apply decoder to each timestep of sequence to get a dictionary of outputs
         transformer_outputs = TensorUtils.time_distributed(
             transformer_outputs, self.nets["decoder"]
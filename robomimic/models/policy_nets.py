@@ -20,7 +20,7 @@ from robomimic.models.base_nets import Module
 from robomimic.models.transformers import GPT_Backbone
 from robomimic.models.obs_nets import MIMO_MLP, RNN_MIMO_MLP, MIMO_Transformer, ObservationDecoder
 from robomimic.models.vae_nets import VAE
-from robomimic.models.distributions import TanhWrappedDistribution
+from robomimic.models.distributions import TanhWrappedDistribution, sample_gmm
 
 
 class ActorNetwork(MIMO_MLP):
@@ -181,7 +181,8 @@ class PerturbationActorNetwork(ActorNetwork):
         perturbations = super(PerturbationActorNetwork, self).forward(inputs, goal_dict)
 
         # add perturbations from network to original actions, and ensure the new actions lie in [-1, 1]
-        output_actions = acts + self.perturbation_scale * perturbations
+        # (the scaled add is a single kernel)
+        output_actions = torch.add(acts, perturbations, alpha=self.perturbation_scale)
         output_actions = output_actions.clamp(-1.0, 1.0)
         return output_actions
 
@@ -276,10 +277,12 @@ class GaussianActorNetwork(ActorNetwork):
         self.mean_limits = np.array(mean_limits)
         self.std_limits = np.array(std_limits)
 
-        # Define activations to use
+        # Define activations to use. Note that softplus(0) = log(2), so the scale is a
+        # constant that does not need to be computed on the device at every call.
+        softplus_scale = self.init_std / np.log(2.)
         def softplus_scaled(x):
             out = F.softplus(x)
-            out = out * (self.init_std / F.softplus(torch.zeros(1).to(x.device)))
+            out = out * softplus_scale
             return out
 
         self.activations = {
@@ -333,9 +336,10 @@ class GaussianActorNetwork(ActorNetwork):
             dist (Distribution): Gaussian distribution
         """
         out = MIMO_MLP.forward(self, obs=obs_dict, goal=goal_dict)
-        mean = out["mean"]
+        # keep distribution parameters in float32, so that log-likelihoods are computed in full precision under autocast
+        mean = out["mean"].float()
         # Use either constant std or learned std depending on setting
-        scale = out["scale"] if not self.fixed_std else torch.ones_like(mean) * self.init_std
+        scale = out["scale"].float() if not self.fixed_std else torch.full_like(mean, self.init_std)
 
         # Clamp the mean
         mean = torch.clamp(mean, min=self.mean_limits[0], max=self.mean_limits[1])
@@ -347,7 +351,7 @@ class GaussianActorNetwork(ActorNetwork):
         # Calculate scale
         if self.low_noise_eval and (not self.training):
             # override std value so that you always approximately sample the mean
-            scale = torch.ones_like(mean) * 1e-4
+            scale = torch.full_like(mean, 1e-4)
         else:
             # Post-process the scale accordingly
             scale = self.activations[self.std_activation](scale)
@@ -505,9 +509,10 @@ class GMMActorNetwork(ActorNetwork):
             dist (Distribution): GMM distribution
         """
         out = MIMO_MLP.forward(self, obs=obs_dict, goal=goal_dict)
-        means = out["mean"]
-        scales = out["scale"]
-        logits = out["logits"]
+        # keep distribution parameters in float32, so that log-likelihoods are computed in full precision under autocast
+        means = out["mean"].float()
+        scales = out["scale"].float()
+        logits = out["logits"].float()
 
         # apply tanh squashing to means if not using tanh-GMM to ensure means are in [-1, 1]
         if not self.use_tanh:
@@ -516,7 +521,7 @@ class GMMActorNetwork(ActorNetwork):
         # Calculate scale
         if self.low_noise_eval and (not self.training):
             # low-noise for all Gaussian dists
-            scales = torch.ones_like(means) * 1e-4
+            scales = torch.full_like(means, 1e-4)
         else:
             # post-process the scale accordingly
             scales = self.activations[self.std_activation](scales) + self.min_std
@@ -663,7 +668,33 @@ class RNNActorNetwork(RNN_MIMO_MLP):
                 msg="RNNActorNetwork: input_shape inconsistent in temporal dimension")
         return [T, self.ac_dim]
 
-    def forward(self, obs_dict, goal_dict=None, rnn_init_state=None, return_state=False):
+    def _expand_goal(self, obs_dict, goal_dict):
+        """
+        Repeats the goal observation in time to match the time dimension of @obs_dict.
+        """
+        if self._is_goal_conditioned:
+            assert goal_dict is not None
+            mod = list(obs_dict.keys())[0]
+            goal_dict = TensorUtils.unsqueeze_expand_at(goal_dict, size=obs_dict[mod].shape[1], dim=1)
+        return goal_dict
+
+    def encode_step(self, obs_dict, goal_dict=None):
+        """
+        Encodes a single timestep of observations into RNN inputs, which can be passed
+        to @forward_step to avoid re-running the observation encoder on the same inputs.
+
+        Args:
+            obs_dict (dict): batch of observations. Should not contain
+                time dimension.
+            goal_dict (dict): if not None, batch of goal observations
+
+        Returns:
+            rnn_inputs (torch.Tensor): encoded inputs of shape [B, 1, D]
+        """
+        obs_dict = TensorUtils.to_sequence(obs_dict)
+        return RNN_MIMO_MLP.encode(self, obs=obs_dict, goal=self._expand_goal(obs_dict, goal_dict))
+
+    def forward(self, obs_dict, goal_dict=None, rnn_init_state=None, return_state=False, rnn_inputs=None):
         """
         Forward a sequence of inputs through the RNN and the per-step network.
 
@@ -673,19 +704,19 @@ class RNNActorNetwork(RNN_MIMO_MLP):
             goal_dict (dict): if not None, batch of goal observations
             rnn_init_state: rnn hidden state, initialize to zero state if set to None
             return_state (bool): whether to return hidden state
+            rnn_inputs (torch.Tensor): if provided, pre-computed encoded inputs (see @encode_step)
+                to use instead of encoding @obs_dict and @goal_dict
 
         Returns:
             actions (torch.Tensor): predicted action sequence
             rnn_state: return rnn state at the end if return_state is set to True
         """
-        if self._is_goal_conditioned:
-            assert goal_dict is not None
+        if rnn_inputs is None:
             # repeat the goal observation in time to match dimension with obs_dict
-            mod = list(obs_dict.keys())[0]
-            goal_dict = TensorUtils.unsqueeze_expand_at(goal_dict, size=obs_dict[mod].shape[1], dim=1)
+            goal_dict = self._expand_goal(obs_dict, goal_dict)
 
         outputs = super(RNNActorNetwork, self).forward(
-            obs=obs_dict, goal=goal_dict, rnn_init_state=rnn_init_state, return_state=return_state)
+            obs=obs_dict, goal=goal_dict, rnn_init_state=rnn_init_state, return_state=return_state, rnn_inputs=rnn_inputs)
 
         if return_state:
             actions, state = outputs
@@ -701,7 +732,7 @@ class RNNActorNetwork(RNN_MIMO_MLP):
         else:
             return actions
 
-    def forward_step(self, obs_dict, goal_dict=None, rnn_state=None):
+    def forward_step(self, obs_dict, goal_dict=None, rnn_state=None, rnn_inputs=None):
         """
         Unroll RNN over single timestep to get actions.
 
@@ -710,6 +741,8 @@ class RNNActorNetwork(RNN_MIMO_MLP):
                 time dimension.
             goal_dict (dict): if not None, batch of goal observations
             rnn_state: rnn hidden state, initialize to zero state if set to None
+            rnn_inputs (torch.Tensor): if provided, output of @encode_step to use
+                instead of encoding @obs_dict and @goal_dict
 
         Returns:
             actions (torch.Tensor): batch of actions - does not contain time dimension
@@ -717,7 +750,7 @@ class RNNActorNetwork(RNN_MIMO_MLP):
         """
         obs_dict = TensorUtils.to_sequence(obs_dict)
         action, state = self.forward(
-            obs_dict, goal_dict, rnn_init_state=rnn_state, return_state=True)
+            obs_dict, goal_dict, rnn_init_state=rnn_state, return_state=True, rnn_inputs=rnn_inputs)
         return action[:, 0], state
 
     def _to_string(self):
@@ -828,7 +861,7 @@ class RNNGMMActorNetwork(RNNActorNetwork):
             logits=(self.num_modes,),
         )
 
-    def forward_train(self, obs_dict, goal_dict=None, rnn_init_state=None, return_state=False):
+    def forward_train(self, obs_dict, goal_dict=None, rnn_init_state=None, return_state=False, rnn_inputs=None):
         """
         Return full GMM distribution, which is useful for computing
         quantities necessary at train-time, like log-likelihood, KL 
@@ -839,28 +872,29 @@ class RNNGMMActorNetwork(RNNActorNetwork):
             goal_dict (dict): if not None, batch of goal observations
             rnn_init_state: rnn hidden state, initialize to zero state if set to None
             return_state (bool): whether to return hidden state
+            rnn_inputs (torch.Tensor): if provided, pre-computed encoded inputs (see @encode_step)
+                to use instead of encoding @obs_dict and @goal_dict
 
         Returns:
             dists (Distribution): sequence of GMM distributions over the timesteps
             rnn_state: return rnn state at the end if return_state is set to True
         """
-        if self._is_goal_conditioned:
-            assert goal_dict is not None
+        if rnn_inputs is None:
             # repeat the goal observation in time to match dimension with obs_dict
-            mod = list(obs_dict.keys())[0]
-            goal_dict = TensorUtils.unsqueeze_expand_at(goal_dict, size=obs_dict[mod].shape[1], dim=1)
+            goal_dict = self._expand_goal(obs_dict, goal_dict)
 
         outputs = RNN_MIMO_MLP.forward(
-            self, obs=obs_dict, goal=goal_dict, rnn_init_state=rnn_init_state, return_state=return_state)
+            self, obs=obs_dict, goal=goal_dict, rnn_init_state=rnn_init_state, return_state=return_state, rnn_inputs=rnn_inputs)
 
         if return_state:
             outputs, state = outputs
         else:
             state = None
         
-        means = outputs["mean"]
-        scales = outputs["scale"]
-        logits = outputs["logits"]
+        # keep distribution parameters in float32, so that log-likelihoods are computed in full precision under autocast
+        means = outputs["mean"].float()
+        scales = outputs["scale"].float()
+        logits = outputs["logits"].float()
 
         # apply tanh squashing to mean if not using tanh-GMM to ensure means are in [-1, 1]
         if not self.use_tanh:
@@ -868,7 +902,7 @@ class RNNGMMActorNetwork(RNNActorNetwork):
 
         if self.low_noise_eval and (not self.training):
             # low-noise for all Gaussian dists
-            scales = torch.ones_like(means) * 1e-4
+            scales = torch.full_like(means, 1e-4)
         else:
             # post-process the scale accordingly
             scales = self.activations[self.std_activation](scales) + self.min_std
@@ -895,18 +929,20 @@ class RNNGMMActorNetwork(RNNActorNetwork):
         else:
             return dists
 
-    def forward(self, obs_dict, goal_dict=None, rnn_init_state=None, return_state=False):
+    def forward(self, obs_dict, goal_dict=None, rnn_init_state=None, return_state=False, rnn_inputs=None):
         """
         Samples actions from the policy distribution.
 
         Args:
             obs_dict (dict): batch of observations
             goal_dict (dict): if not None, batch of goal observations
+            rnn_inputs (torch.Tensor): if provided, pre-computed encoded inputs (see @encode_step)
+                to use instead of encoding @obs_dict and @goal_dict
 
         Returns:
             action (torch.Tensor): batch of actions from policy distribution
         """
-        out = self.forward_train(obs_dict=obs_dict, goal_dict=goal_dict, rnn_init_state=rnn_init_state, return_state=return_state)
+        out = self.forward_train(obs_dict=obs_dict, goal_dict=goal_dict, rnn_init_state=rnn_init_state, return_state=return_state, rnn_inputs=rnn_inputs)
         if return_state:
             ad, state = out
             return ad.sample(), state
@@ -948,7 +984,7 @@ class RNNGMMActorNetwork(RNNActorNetwork):
         )
         return ad, state
 
-    def forward_step(self, obs_dict, goal_dict=None, rnn_state=None):
+    def forward_step(self, obs_dict, goal_dict=None, rnn_state=None, rnn_inputs=None):
         """
         Unroll RNN over single timestep to get sampled actions.
 
@@ -957,6 +993,8 @@ class RNNGMMActorNetwork(RNNActorNetwork):
                 time dimension.
             goal_dict (dict): if not None, batch of goal observations
             rnn_state: rnn hidden state, initialize to zero state if set to None
+            rnn_inputs (torch.Tensor): if provided, output of @encode_step to use
+                instead of encoding @obs_dict and @goal_dict
 
         Returns:
             acts (torch.Tensor): batch of actions - does not contain time dimension
@@ -964,7 +1002,7 @@ class RNNGMMActorNetwork(RNNActorNetwork):
         """
         obs_dict = TensorUtils.to_sequence(obs_dict)
         acts, state = self.forward(
-            obs_dict, goal_dict, rnn_init_state=rnn_state, return_state=True)
+            obs_dict, goal_dict, rnn_init_state=rnn_state, return_state=True, rnn_inputs=rnn_inputs)
         assert acts.shape[1] == 1
         return acts[:, 0], state
 
@@ -1097,7 +1135,7 @@ class TransformerActorNetwork(MIMO_Transformer):
                 msg="TransformerActorNetwork: input_shape inconsistent in temporal dimension")
         return [T, self.ac_dim]
 
-    def forward(self, obs_dict, actions=None, goal_dict=None):
+    def forward(self, obs_dict, actions=None, goal_dict=None, last_step_only=False):
         """
         Forward a sequence of inputs through the Transformer.
         Args:
@@ -1105,6 +1143,8 @@ class TransformerActorNetwork(MIMO_Transformer):
                 should have leading dimensions batch and time [B, T, ...]
             actions (torch.Tensor): batch of actions of shape [B, T, D]
             goal_dict (dict): if not None, batch of goal observations
+            last_step_only (bool): if True, only predict the action at the final timestep,
+                so that the temporal dimension of the output has size 1
         Returns:
             outputs (torch.Tensor or dict): contains predicted action sequence, or dictionary
                 with predicted action sequence and predicted observation sequences
@@ -1116,7 +1156,7 @@ class TransformerActorNetwork(MIMO_Transformer):
             goal_dict = TensorUtils.unsqueeze_expand_at(goal_dict, size=obs_dict[mod].shape[1], dim=1)
 
         forward_kwargs = dict(obs=obs_dict, goal=goal_dict)
-        outputs = super(TransformerActorNetwork, self).forward(**forward_kwargs)
+        outputs = super(TransformerActorNetwork, self).forward(last_step_only=last_step_only, **forward_kwargs)
 
         # apply tanh squashing to ensure actions are in [-1, 1]
         outputs["action"] = torch.tanh(outputs["action"])
@@ -1255,17 +1295,22 @@ class TransformerGMMActorNetwork(TransformerActorNetwork):
             logits=(self.num_modes,),
         )
 
-    def forward_train(self, obs_dict, actions=None, goal_dict=None, low_noise_eval=None):
+    def forward_train_params(self, obs_dict, actions=None, goal_dict=None, low_noise_eval=None, last_step_only=False):
         """
-        Return full GMM distribution, which is useful for computing
-        quantities necessary at train-time, like log-likelihood, KL 
-        divergence, etc.
+        Return the parameters of the GMM distributions over the timesteps, without constructing
+        the distribution objects. This is useful for slicing the parameters (e.g. to a single
+        timestep) before building distributions with @dist_from_params.
         Args:
             obs_dict (dict): batch of observations
             actions (torch.Tensor): batch of actions
             goal_dict (dict): if not None, batch of goal observations
+            low_noise_eval (bool): if provided, overrides @self.low_noise_eval
+            last_step_only (bool): if True, only predict parameters for the final timestep,
+                so that T = 1 in the returned shapes
         Returns:
-            dists (Distribution): sequence of GMM distributions over the timesteps
+            means (torch.Tensor): GMM component means of shape [B, T, num_modes, ac_dim]
+            scales (torch.Tensor): GMM component scales of shape [B, T, num_modes, ac_dim]
+            logits (torch.Tensor): GMM mixture logits of shape [B, T, num_modes]
         """
         if self._is_goal_conditioned:
             assert goal_dict is not None
@@ -1275,11 +1320,12 @@ class TransformerGMMActorNetwork(TransformerActorNetwork):
 
         forward_kwargs = dict(obs=obs_dict, goal=goal_dict)
 
-        outputs = MIMO_Transformer.forward(self, **forward_kwargs)
+        outputs = MIMO_Transformer.forward(self, last_step_only=last_step_only, **forward_kwargs)
         
-        means = outputs["mean"]
-        scales = outputs["scale"]
-        logits = outputs["logits"]
+        # keep distribution parameters in float32, so that log-likelihoods are computed in full precision under autocast
+        means = outputs["mean"].float()
+        scales = outputs["scale"].float()
+        logits = outputs["logits"].float()
 
         # apply tanh squashing to mean if not using tanh-GMM to ensure means are in [-1, 1]
         if not self.use_tanh:
@@ -1289,11 +1335,23 @@ class TransformerGMMActorNetwork(TransformerActorNetwork):
             low_noise_eval = self.low_noise_eval
         if low_noise_eval and (not self.training):
             # low-noise for all Gaussian dists
-            scales = torch.ones_like(means) * 1e-4
+            scales = torch.full_like(means, 1e-4)
         else:
             # post-process the scale accordingly
             scales = self.activations[self.std_activation](scales) + self.min_std
 
+        return means, scales, logits
+
+    def dist_from_params(self, means, scales, logits):
+        """
+        Construct GMM distributions from parameters returned by @forward_train_params.
+        Args:
+            means (torch.Tensor): GMM component means of shape [..., num_modes, ac_dim]
+            scales (torch.Tensor): GMM component scales of shape [..., num_modes, ac_dim]
+            logits (torch.Tensor): GMM mixture logits of shape [..., num_modes]
+        Returns:
+            dists (Distribution): GMM distributions with batch shape [...]
+        """
         # mixture components - make sure that `batch_shape` for the distribution is equal
         # to (batch_size, timesteps, num_modes) since MixtureSameFamily expects this shape
         component_distribution = D.Normal(loc=means, scale=scales)
@@ -1313,18 +1371,40 @@ class TransformerGMMActorNetwork(TransformerActorNetwork):
 
         return dists
 
-    def forward(self, obs_dict, actions=None, goal_dict=None):
+    def forward_train(self, obs_dict, actions=None, goal_dict=None, low_noise_eval=None):
+        """
+        Return full GMM distribution, which is useful for computing
+        quantities necessary at train-time, like log-likelihood, KL 
+        divergence, etc.
+        Args:
+            obs_dict (dict): batch of observations
+            actions (torch.Tensor): batch of actions
+            goal_dict (dict): if not None, batch of goal observations
+        Returns:
+            dists (Distribution): sequence of GMM distributions over the timesteps
+        """
+        means, scales, logits = self.forward_train_params(
+            obs_dict=obs_dict, actions=actions, goal_dict=goal_dict, low_noise_eval=low_noise_eval)
+        return self.dist_from_params(means, scales, logits)
+
+    def forward(self, obs_dict, actions=None, goal_dict=None, last_step_only=False):
         """
         Samples actions from the policy distribution.
         Args:
             obs_dict (dict): batch of observations
             actions (torch.Tensor): batch of actions
             goal_dict (dict): if not None, batch of goal observations
+            last_step_only (bool): if True, only sample actions for the final timestep
         Returns:
             action (torch.Tensor): batch of actions from policy distribution
         """
-        out = self.forward_train(obs_dict=obs_dict, actions=actions, goal_dict=goal_dict)
-        return out.sample()
+        means, scales, logits = self.forward_train_params(
+            obs_dict=obs_dict, actions=actions, goal_dict=goal_dict, last_step_only=last_step_only)
+        # sample directly from the mixture parameters, without building the distribution objects
+        samples = sample_gmm(means, scales, logits)
+        if self.use_tanh:
+            samples = torch.tanh(samples)
+        return samples
 
     def _to_string(self):
         """Info to pretty print."""
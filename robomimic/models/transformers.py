@@ -32,6 +32,13 @@ class GEGLU(nn.Module):
         return self.geglu(x)
 
 
+# maps activation names in the config to activation classes
+TRANSFORMER_ACTIVATIONS = {
+    "gelu": nn.GELU,
+    "geglu": GEGLU,
+}
+
+
 class PositionalEncoding(nn.Module):
     """
     Taken from https://pytorch.org/tutorials/beginner/transformer_tutorial.html.
@@ -145,6 +152,11 @@ class CausalSelfAttention(Module):
         )
         self.register_buffer("mask", mask)
 
+        # boolean version of the mask that marks the entries to exclude from attention. It is precomputed
+        # so that every forward pass does not need to compare against @self.mask. It is not persistent,
+        # since it can always be rebuilt from @self.mask (which is kept for checkpoint compatibility).
+        self.register_buffer("masked_entries", mask == 0, persistent=False)
+
     def forward(self, x):
         """
         Forward pass through Self-Attention block.
@@ -181,7 +193,7 @@ class CausalSelfAttention(Module):
         # use mask to replace entries in dot products with negative inf to ensure they don't contribute to softmax,
         # then take softmax over last dimension to end up with attention score for each member of sequence.
         # Note the use of [:T, :T] -  this makes it so we can handle sequences less than @self.context_length in length.
-        att = att.masked_fill(self.mask[..., :T, :T] == 0, float("-inf"))
+        att = att.masked_fill(self.masked_entries[..., :T, :T], float("-inf"))
         att = F.softmax(
             att, dim=-1
         )  # shape [B, NH, T, T], last dimension has score over all T for each sequence member
@@ -350,10 +362,9 @@ class GPT_Backbone(Module):
         self.attn_dropout = attn_dropout
         self.block_output_dropout = block_output_dropout
 
-        if activation == "gelu":
-            self.activation = nn.GELU()
-        elif activation == "geglu":
-            self.activation = GEGLU()
+        if activation not in TRANSFORMER_ACTIVATIONS:
+            raise KeyError("unknown transformer activation {} - options are {}".format(activation, list(TRANSFORMER_ACTIVATIONS)))
+        self.activation = TRANSFORMER_ACTIVATIONS[activation]()
 
         # create networks
         self._create_networks()
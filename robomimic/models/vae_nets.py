@@ -400,7 +400,7 @@ class GaussianPrior(Prior):
 
                 # make uniform weights (in the case that weights were not learned)
                 if not self.gmm_learn_weights:
-                    prior_weights = torch.ones(n, self.num_modes).to(prior_means.device) / self.num_modes
+                    prior_weights = torch.full((n, self.num_modes), 1. / self.num_modes, device=prior_means.device)
 
                 # sample modes
                 gmm_mode_indices = D.Categorical(prior_weights).sample()
@@ -661,7 +661,7 @@ class CategoricalPrior(Prior):
                 dist_samples = torch.arange(n).remainder(self.categorical_dim).unsqueeze(-1).to(self.device)
             else:
                 # sample one-hot latents from uniform categorical distribution for each latent dimension
-                probs = torch.ones(n, self.latent_dim, self.categorical_dim).float().to(self.device)
+                probs = torch.ones(n, self.latent_dim, self.categorical_dim, device=self.device)
                 dist_samples = D.Categorical(probs=probs).sample()
             z = TensorUtils.to_one_hot(dist_samples, num_class=self.categorical_dim)
 
@@ -690,19 +690,18 @@ class CategoricalPrior(Prior):
             kl_loss (torch.Tensor): KL divergence loss
         """
         logits = posterior_params["logit"].reshape(-1, self.latent_dim, self.categorical_dim)
+        posterior_dist = D.Categorical(logits=logits)
         if not self.learnable:
-            # prior logits correspond to uniform categorical distribution
-            prior_logits = torch.zeros_like(logits)
+            # prior is a uniform categorical distribution, so KL(q || U) = log(C) - H(q). This
+            # avoids allocating a full tensor of zero prior logits just to build the prior.
+            kl_loss = np.log(self.categorical_dim) - posterior_dist.entropy()
         else:
             # forward to get parameters
             out = self.forward(batch_size=posterior_params["logit"].shape[0], obs_dict=obs_dict, goal_dict=goal_dict)
-            prior_logits = out["logit"]
-
-        prior_dist = D.Categorical(logits=prior_logits)
-        posterior_dist = D.Categorical(logits=logits)
+            prior_dist = D.Categorical(logits=out["logit"])
+            kl_loss = D.kl_divergence(posterior_dist, prior_dist)
 
         # sum over latent dimensions, but average over batch dimension
-        kl_loss = D.kl_divergence(posterior_dist, prior_dist)
         assert len(kl_loss.shape) == 2
         return kl_loss.sum(-1).mean()
 
@@ -1276,11 +1275,11 @@ class VAE(torch.nn.Module):
         # reduce errors across modalities and dimensions
         if self.decoder_reconstruction_sum_across_elements:
             # average across batch but sum across modalities and dimensions
-            loss = sum([x.sum() for x in recons_errors])
+            loss = torch.stack([x.sum() for x in recons_errors]).sum()
             loss /= batch_size
         else:
             # compute mse loss in each modality and average across modalities
-            loss = sum([x.mean() for x in recons_errors])
+            loss = torch.stack([x.mean() for x in recons_errors]).sum()
             loss /= num_mods
         return loss
 
@@ -267,6 +267,11 @@ class DistributionalActionValueNetwork(ActionValueNetwork):
             encoder_kwargs=encoder_kwargs,
         )
 
+        # keep value atoms in a (non-persistent) buffer, so that they live on the same device as the
+        # network and do not need to be copied to the device on every forward pass. Unsqueeze to make
+        # sure atoms are compatible with batch operations.
+        self.register_buffer("_value_atoms", torch.Tensor(self._atoms).unsqueeze(0), persistent=False)
+
     def _get_output_shapes(self):
         """
         Network outputs log probabilities for categorical distribution over discrete value grid.
@@ -294,9 +299,7 @@ class DistributionalActionValueNetwork(ActionValueNetwork):
         logits = MIMO_MLP.forward(self, obs=inputs, goal=goal_dict)["log_probs"]
 
         # turn these logits into a categorical distribution over the value atoms.
-        # (unsqueeze to make sure atoms are compatible with batch operations)
-        value_atoms = torch.Tensor(self._atoms).unsqueeze(0).to(logits.device)
-        return DiscreteValueDistribution(values=value_atoms, logits=logits)
+        return DiscreteValueDistribution(values=self._value_atoms, logits=logits)
 
     def forward(self, obs_dict, acts, goal_dict=None):
         """
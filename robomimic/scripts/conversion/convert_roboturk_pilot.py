@@ -49,8 +49,7 @@ def convert_rt_pilot_hdf5(ref_folder):
 
     # sorted list of demonstrations by demo number
     demos = list(f["data"].keys())
-    inds = np.argsort([int(elem[5:]) for elem in demos])
-    demos = [demos[i] for i in inds]
+    demos = sorted(demos, key=lambda elem: int(elem[5:]))
 
     # write each demo
     num_samples_arr = []
@@ -231,8 +231,7 @@ def dataset_states_to_obs(args):
     # list of all demonstration episodes (sorted in increasing number order)
     f = h5py.File(args.dataset, "r")
     demos = list(f["data"].keys())
-    inds = np.argsort([int(elem[5:]) for elem in demos])
-    demos = [demos[i] for i in inds]
+    demos = sorted(demos, key=lambda elem: int(elem[5:]))
 
     # maybe reduce the number of demonstrations to playback
     if args.n is not None:
@@ -68,8 +68,7 @@ if __name__ == "__main__":
                 all_filter_keys[fk] = fk_demos
 
     # put demonstration list in increasing episode order
-    inds = np.argsort([int(elem[5:]) for elem in demos])
-    demos = [demos[i] for i in inds]
+    demos = sorted(demos, key=lambda elem: int(elem[5:]))
 
     # extract length of each trajectory in the file
     traj_lengths = []
@@ -133,8 +133,9 @@ def playback_trajectory_with_env(
             if i < traj_len - 1:
                 # check whether the actions deterministically lead to the same recorded states
                 state_playback = env.get_state()["states"]
-                if not np.all(np.equal(states[i + 1], state_playback)):
-                    err = np.linalg.norm(states[i + 1] - state_playback)
+                diff = states[i + 1] - state_playback
+                if diff.any():
+                    err = np.sqrt(np.dot(diff, diff))
                     print("warning: playback diverged by {} at step {}".format(err, i))
         else:
             env.reset_to({"states" : states[i]})
@@ -249,8 +250,7 @@ def playback_dataset(args):
         demos = [elem.decode("utf-8") for elem in np.array(f["mask/{}".format(args.filter_key)])]
     else:
         demos = list(f["data"].keys())
-    inds = np.argsort([int(elem[5:]) for elem in demos])
-    demos = [demos[i] for i in inds]
+    demos = sorted(demos, key=lambda elem: int(elem[5:]))
 
     # maybe reduce the number of demonstrations to playback
     if args.n is not None:
@@ -13,6 +13,12 @@ Args:
     dataset (str): if provided, override the dataset path defined in the config
 
     debug (bool): set this flag to run a quick training run for debugging purposes    
+
+Example usage:
+
+    # multi-GPU data-parallel training - gradients are averaged across processes, and
+    # only the first process logs, runs rollouts, and saves checkpoints
+    torchrun --nproc_per_node=4 train.py --config /path/to/config.json
 """
 
 import argparse
@@ -24,12 +30,15 @@ import shutil
 import psutil
 import sys
 import socket
+import signal
 import traceback
+import faulthandler
 
 from collections import OrderedDict
 
 import torch
 from torch.utils.data import DataLoader
+from torch.utils.data.distributed import DistributedSampler
 
 import robomimic
 import robomimic.utils.train_utils as TrainUtils
@@ -51,14 +60,23 @@ def train(config, device):
     np.random.seed(config.train.seed)
     torch.manual_seed(config.train.seed)
 
-    torch.set_num_threads(2)
+    # use at most 2 intra-op threads per process, and fewer if the training processes and their
+    # data loader workers would otherwise oversubscribe the available cores
+    world_size = torch.distributed.get_world_size() if TorchUtils.is_distributed() else 1
+    procs_per_rank = 1 + config.train.num_data_workers
+    torch.set_num_threads(max(1, min(2, (os.cpu_count() or 1) // (world_size * procs_per_rank))))
 
-    print("\n============= New Training Run with Config =============")
-    print(config)
-    print("")
-    log_dir, ckpt_dir, video_dir = TrainUtils.get_exp_dir(config)
+    # in distributed training, only the main process logs, runs rollouts, and saves checkpoints
+    is_main_process = TorchUtils.is_main_process()
+
+    log_dir, ckpt_dir, video_dir = None, None, None
+    if is_main_process:
+        print("\n============= New Training Run with Config =============")
+        print(config)
+        print("")
+        log_dir, ckpt_dir, video_dir = TrainUtils.get_exp_dir(config)
 
-    if config.experiment.logging.terminal_output_to_txt:
+    if is_main_process and config.experiment.logging.terminal_output_to_txt:
         # log stdout and stderr to a text file
         logger = PrintLogger(os.path.join(log_dir, 'log.txt'))
         sys.stdout = logger
@@ -87,7 +105,7 @@ def train(config, device):
 
     # create environment
     envs = OrderedDict()
-    if config.experiment.rollout.enabled:
+    if config.experiment.rollout.enabled and is_main_process:
         # create environments for validation runs
         env_names = [env_meta["env_name"]]
 
@@ -111,12 +129,14 @@ def train(config, device):
     print("")
 
     # setup for a new training run
-    data_logger = DataLogger(
-        log_dir,
-        config,
-        log_tb=config.experiment.logging.log_tb,
-        log_wandb=config.experiment.logging.log_wandb,
-    )
+    data_logger = None
+    if is_main_process:
+        data_logger = DataLogger(
+            log_dir,
+            config,
+            log_tb=config.experiment.logging.log_tb,
+            log_wandb=config.experiment.logging.log_wandb,
+        )
     model = algo_factory(
         algo_name=config.algo_name,
         config=config,
@@ -124,19 +144,28 @@ def train(config, device):
         ac_dim=shape_meta["ac_dim"],
         device=device,
     )
+    # start every process from the same weights
+    TorchUtils.broadcast_state_dict(model.serialize())
     
-    # save the config as a json file
-    with open(os.path.join(log_dir, '..', 'config.json'), 'w') as outfile:
-        json.dump(config, outfile, indent=4)
-
-    print("\n============= Model Summary =============")
-    print(model)  # print model summary
-    print("")
+    # save the config as a json file, and print a model summary
+    if is_main_process:
+        config_path = os.path.join(log_dir, '..', 'config.json')
+        with open(config_path + ".tmp", 'w') as outfile:
+            json.dump(config, outfile, indent=4)
+        os.replace(config_path + ".tmp", config_path)
+
+        print("\n============= Model Summary =============")
+        print(model)  # print model summary
+        print("")
 
     # load training data
     trainset, validset = TrainUtils.load_data_for_training(
         config, obs_keys=shape_meta["all_obs_keys"])
     train_sampler = trainset.get_dataset_sampler()
+    if TorchUtils.is_distributed():
+        # each process trains on its own shard of the dataset
+        assert train_sampler is None, "custom dataset samplers are not supported in distributed training"
+        train_sampler = DistributedSampler(trainset, shuffle=True, seed=config.train.seed, drop_last=True)
     print("\n============= Training Dataset =============")
     print(trainset)
     print("")
@@ -150,6 +179,14 @@ def train(config, device):
     if config.train.hdf5_normalize_obs:
         obs_normalization_stats = trainset.get_obs_normalization_stats()
 
+    # options that only apply when loading data with worker processes - keep workers (and the hdf5
+    # file handles they open lazily) alive across epochs, and let each worker queue up several
+    # batches to hide hdf5 read latency
+    def worker_loader_kwargs(num_workers):
+        if num_workers == 0:
+            return dict()
+        return dict(persistent_workers=True, prefetch_factor=config.train.get("prefetch_factor", 4))
+
     # initialize data loaders
     train_loader = DataLoader(
         dataset=trainset,
@@ -157,10 +194,12 @@ def train(config, device):
         batch_size=config.train.batch_size,
         shuffle=(train_sampler is None),
         num_workers=config.train.num_data_workers,
-        drop_last=True
+        pin_memory=(device.type == "cuda"),
+        drop_last=True,
+        **worker_loader_kwargs(config.train.num_data_workers),
     )
 
-    if config.experiment.validate:
+    if config.experiment.validate and is_main_process:
         # cap num workers for validation dataset at 1
         num_workers = min(config.train.num_data_workers, 1)
         valid_sampler = validset.get_dataset_sampler()
@@ -170,7 +209,9 @@ def train(config, device):
             batch_size=config.train.batch_size,
             shuffle=(valid_sampler is None),
             num_workers=num_workers,
-            drop_last=True
+            pin_memory=(device.type == "cuda"),
+            drop_last=True,
+            **worker_loader_kwargs(num_workers),
         )
     else:
         valid_loader = None
@@ -193,15 +234,29 @@ def train(config, device):
     valid_num_steps = config.experiment.validation_epoch_every_n_steps
 
     for epoch in range(1, config.train.num_epochs + 1): # epoch numbers start at 1
+        # wait for the main process to finish evaluating and saving the previous epoch
+        TorchUtils.barrier()
+        if isinstance(train_sampler, DistributedSampler):
+            # reshuffle the dataset shards every epoch
+            train_sampler.set_epoch(epoch)
         step_log = TrainUtils.run_epoch(
             model=model,
             data_loader=train_loader,
             epoch=epoch,
             num_steps=train_num_steps,
             obs_normalization_stats=obs_normalization_stats,
+            log_every_n_steps=config.experiment.logging.get("log_every_n_steps", 1),
+            prefetch_to_device=config.train.get("prefetch_to_device", False),
         )
         model.on_epoch_end(epoch)
 
+        # report training metrics averaged over all processes
+        step_log = TorchUtils.all_reduce_log(step_log, device=device)
+
+        if not is_main_process:
+            # other processes wait for the main process at the start of the next epoch
+            continue
+
         # setup checkpoint path
         epoch_ckpt_name = "model_epoch_{}".format(epoch)
 
@@ -221,21 +276,26 @@ def train(config, device):
 
         print("Train Epoch {}".format(epoch))
         print(json.dumps(step_log, sort_keys=True, indent=4))
-        for k, v in step_log.items():
-            if k.startswith("Time_"):
-                data_logger.record("Timing_Stats/Train_{}".format(k[5:]), v, epoch)
-            else:
-                data_logger.record("Train/{}".format(k), v, epoch)
+        data_logger.record_dict({
+            ("Timing_Stats/Train_{}".format(k[5:]) if k.startswith("Time_") else "Train/{}".format(k)): v
+            for k, v in step_log.items()
+        }, epoch)
 
         # Evaluate the model on validation set
         if config.experiment.validate:
             with torch.no_grad():
-                step_log = TrainUtils.run_epoch(model=model, data_loader=valid_loader, epoch=epoch, validate=True, num_steps=valid_num_steps)
-            for k, v in step_log.items():
-                if k.startswith("Time_"):
-                    data_logger.record("Timing_Stats/Valid_{}".format(k[5:]), v, epoch)
-                else:
-                    data_logger.record("Valid/{}".format(k), v, epoch)
+                step_log = TrainUtils.run_epoch(
+                    model=model,
+                    data_loader=valid_loader,
+                    epoch=epoch,
+                    validate=True,
+                    num_steps=valid_num_steps,
+                    prefetch_to_device=config.train.get("prefetch_to_device", False),
+                )
+            data_logger.record_dict({
+                ("Timing_Stats/Valid_{}".format(k[5:]) if k.startswith("Time_") else "Valid/{}".format(k)): v
+                for k, v in step_log.items()
+            }, epoch)
 
             print("Validation Epoch {}".format(epoch))
             print(json.dumps(step_log, sort_keys=True, indent=4))
@@ -259,6 +319,13 @@ def train(config, device):
             # wrap model as a RolloutPolicy to prepare for rollouts
             rollout_model = RolloutPolicy(model, obs_normalization_stats=obs_normalization_stats)
 
+            # videos are only kept if a checkpoint is saved for a reason other than validation loss (see below),
+            # so skip rendering them altogether if this can already be ruled out before running the rollouts
+            may_keep_video = config.experiment.keep_all_videos or \
+                (should_save_ckpt and (ckpt_reason != "valid")) or \
+                (config.experiment.save.enabled and (config.experiment.save.on_best_rollout_return or
+                    config.experiment.save.on_best_rollout_success_rate))
+
             num_episodes = config.experiment.rollout.n
             all_rollout_logs, video_paths = TrainUtils.rollout_with_stats(
                 policy=rollout_model,
@@ -267,7 +334,7 @@ def train(config, device):
                 use_goals=config.use_goals,
                 num_episodes=num_episodes,
                 render=False,
-                video_dir=video_dir if config.experiment.render_video else None,
+                video_dir=video_dir if (config.experiment.render_video and may_keep_video) else None,
                 epoch=epoch,
                 video_skip=config.experiment.get("video_skip", 5),
                 terminate_on_success=config.experiment.rollout.terminate_on_success,
@@ -325,12 +392,20 @@ def train(config, device):
         data_logger.record("System/RAM Usage (MB)", mem_usage, epoch)
         print("\nEpoch {} Memory Usage: {} MB\n".format(epoch, mem_usage))
 
-    # terminate logging
-    data_logger.close()
+    # terminate logging once the main process has finished the last epoch
+    TorchUtils.barrier()
+    if is_main_process:
+        data_logger.close()
 
 
 def main(args):
 
+    # dump Python tracebacks on fatal signals (e.g. segfaults in native code), and for all threads on
+    # SIGUSR1, which helps diagnose runs that hang (e.g. stuck collectives in distributed training)
+    faulthandler.enable()
+    if hasattr(signal, "SIGUSR1"):
+        faulthandler.register(signal.SIGUSR1, all_threads=True)
+
     if args.config is not None:
         ext_cfg = json.load(open(args.config, 'r'))
         config = config_factory(ext_cfg["algo_name"])
@@ -347,37 +422,69 @@ def main(args):
     if args.name is not None:
         config.experiment.name = args.name
 
-    # get torch device
+    if config.train.get("cuda_expandable_segments", False):
+        # let the CUDA caching allocator grow memory segments in-place instead of allocating new fixed-size
+        # segments, which reduces fragmentation when tensor sizes vary across steps (e.g. rollouts between
+        # training epochs). This must be set before the first CUDA allocation, and user settings take precedence.
+        torch_version = tuple(int(v) for v in torch.__version__.split("+")[0].split(".")[:2])
+        if torch_version >= (2, 1):
+            os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True")
+        else:
+            print("WARNING: train.cuda_expandable_segments requires torch >= 2.1, ignoring it")
+
+    # set up multi-GPU data-parallel training if launched with torchrun, and get torch device
+    TorchUtils.init_distributed(try_to_use_cuda=config.train.cuda)
     device = TorchUtils.get_torch_device(try_to_use_cuda=config.train.cuda)
+    if config.train.get("allow_tf32", False):
+        # trade a little float32 precision for much faster matmuls (cudnn already allows TF32
+        # convolutions by default, but set it explicitly in case it was turned off)
+        torch.set_float32_matmul_precision("high")
+        torch.backends.cudnn.allow_tf32 = True
 
     # maybe modify config for debugging purposes
     if args.debug:
         # shrink length of training to test whether this run is likely to crash
-        config.unlock()
-        config.lock_keys()
-
-        # train and validate (if enabled) for 3 gradient steps, for 2 epochs
-        config.experiment.epoch_every_n_steps = 3
-        config.experiment.validation_epoch_every_n_steps = 3
-        config.train.num_epochs = 2
-
-        # if rollouts are enabled, try 2 rollouts at end of each epoch, with 10 environment steps
-        config.experiment.rollout.rate = 1
-        config.experiment.rollout.n = 2
-        config.experiment.rollout.horizon = 10
-
-        # send output to a temporary directory
-        config.train.output_dir = "/tmp/tmp_trained_models"
+        debug_cfg = {
+            "experiment": {
+                # train and validate (if enabled) for 3 gradient steps, for 2 epochs
+                "epoch_every_n_steps": 3,
+                "validation_epoch_every_n_steps": 3,
+                # if rollouts are enabled, try 2 rollouts at end of each epoch, with 10 environment steps
+                "rollout": {"rate": 1, "n": 2, "horizon": 10},
+            },
+            "train": {
+                "num_epochs": 2,
+                # send output to a temporary directory
+                "output_dir": "/tmp/tmp_trained_models",
+            },
+        }
+        with config.values_unlocked():
+            config.update(debug_cfg)
 
     # lock config to prevent further modifications and ensure missing keys raise errors
     config.lock()
 
+    if config.train.get("compile", False):
+        # keep compiled kernels in a cache next to the training outputs instead of the default location
+        # under /tmp (often a small tmpfs that is wiped between jobs), so that later runs can reuse them
+        output_root = os.path.expanduser(config.train.output_dir)
+        if not os.path.isabs(output_root):
+            # relative paths are specified relative to robomimic module location
+            output_root = os.path.join(robomimic.__path__[0], output_root)
+        os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", os.path.join(output_root, ".inductor_cache"))
+        print("torch.compile cache directory: {}".format(os.environ["TORCHINDUCTOR_CACHE_DIR"]))
+
     # catch error during training and print it
     res_str = "finished run successfully!"
     try:
         train(config, device=device)
     except Exception as e:
         res_str = "run failed with error:\n{}\n\n{}".format(e, traceback.format_exc())
+    if TorchUtils.is_distributed():
+        # tag output with the rank, and release communicators right away so that a failed rank
+        # does not keep the others waiting on collectives until they time out
+        res_str = "[rank {}] {}".format(torch.distributed.get_rank(), res_str)
+        torch.distributed.destroy_process_group()
     print(res_str)
 
 
@@ -172,8 +172,7 @@ class SequenceDataset(torch.utils.data.Dataset):
             self.demos = list(self.hdf5_file["data"].keys())
 
         # sort demo keys
-        inds = np.argsort([int(elem[5:]) for elem in self.demos])
-        self.demos = [self.demos[i] for i in inds]
+        self.demos = sorted(self.demos, key=lambda elem: int(elem[5:]))
 
         self.n_demos = len(self.demos)
 
@@ -212,7 +211,16 @@ class SequenceDataset(torch.utils.data.Dataset):
         This property allows for a lazy hdf5 file open.
         """
         if self._hdf5_file is None:
-            self._hdf5_file = h5py.File(self.hdf5_path, 'r', swmr=self.hdf5_use_swmr, libver='latest')
+            # use a larger chunk cache than the 1 MB default so that repeated reads of small
+            # per-demo datasets do not keep evicting and re-decompressing the same chunks
+            self._hdf5_file = h5py.File(
+                self.hdf5_path,
+                'r',
+                swmr=self.hdf5_use_swmr,
+                libver='latest',
+                rdcc_nbytes=64 * 1024 * 1024,
+                rdcc_nslots=100003,
+            )
         return self._hdf5_file
 
     def close_and_delete_hdf5_handle(self):
@@ -290,7 +298,14 @@ class SequenceDataset(torch.utils.data.Dataset):
             # get other dataset keys
             for k in dataset_keys:
                 if k in hdf5_file["data/{}".format(ep)]:
-                    all_data[ep][k] = hdf5_file["data/{}/{}".format(ep, k)][()].astype('float32')
+                    ds = hdf5_file["data/{}/{}".format(ep, k)]
+                    if ds.dtype.kind in "fiu" and ds.size > 0:
+                        # read numeric data straight into a float32 buffer instead of reading and then casting a copy
+                        all_data[ep][k] = np.empty(ds.shape, dtype=np.float32)
+                        ds.read_direct(all_data[ep][k])
+                    else:
+                        # bool / enum data (e.g. dones) and empty datasets are read and then cast
+                        all_data[ep][k] = ds[()].astype('float32')
                 else:
                     all_data[ep][k] = np.zeros((all_data[ep]["attrs"]["num_samples"], 1), dtype=np.float32)
 
@@ -143,6 +143,27 @@ class DataLogger(object):
             except Exception as e:
                 log_warning("wandb logging: {}".format(e))
 
+    def record_dict(self, d, epoch):
+        """
+        Record several scalars with logger at once. This is equivalent to calling @record
+        on each item, but sends all of them to wandb in a single call.
+        Args:
+            d (dict): maps key strings to scalar values to store
+            epoch: current epoch number
+        """
+        for k, v in d.items():
+            # maybe update internal cache for any previously logged key
+            if k in self._data:
+                self._data[k].append(v)
+            if self._tb_logger is not None:
+                self._tb_logger.add_scalar(k, v, epoch)
+
+        if self._wandb_logger is not None and len(d) > 0:
+            try:
+                self._wandb_logger.log(dict(d), step=epoch)
+            except Exception as e:
+                log_warning("wandb logging: {}".format(e))
+
     def get_stats(self, k):
         """
         Computes running statistics for a particular key.
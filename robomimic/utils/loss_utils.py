@@ -19,10 +19,36 @@ def cosine_loss(preds, labels):
     Returns:
         loss (torch.Tensor): cosine loss
     """
-    sim = torch.nn.CosineSimilarity(dim=len(preds.shape) - 1)(preds, labels)
+    sim = F.cosine_similarity(preds, labels, dim=-1)
     return -torch.mean(sim - 1.0)
 
 
+def action_losses(preds, labels):
+    """
+    Computes the L2 loss, smooth L1 loss, and cosine loss between predicted and target actions
+    in a single function, so that the difference between the action tensors is only computed
+    once. The cosine loss is computed over the first 3 action dimensions (the end effector
+    delta position).
+
+    Args:
+        preds (torch.Tensor): predicted actions of shape (..., D)
+        labels (torch.Tensor): target actions of shape (..., D)
+
+    Returns:
+        l2_loss (torch.Tensor): mean squared error, same as nn.MSELoss
+        l1_loss (torch.Tensor): smooth L1 loss, same as nn.SmoothL1Loss
+        cos_loss (torch.Tensor): cosine loss on first 3 dimensions, same as @cosine_loss
+    """
+    diff = preds - labels
+    abs_diff = diff.abs()
+    sq_diff = diff * diff
+    l2_loss = sq_diff.mean()
+    l1_loss = torch.where(abs_diff < 1.0, 0.5 * sq_diff, abs_diff - 0.5).mean()
+    sim = F.cosine_similarity(preds[..., :3], labels[..., :3], dim=-1)
+    cos_loss = -torch.mean(sim - 1.0)
+    return l2_loss, l1_loss, cos_loss
+
+
 def KLD_0_1_loss(mu, logvar):
     """
     KL divergence loss. Computes D_KL( N(mu, sigma) || N(0, 1) ). Note that 
@@ -53,10 +79,12 @@ def KLD_gaussian_loss(mu_1, logvar_1, mu_2, logvar_2):
     Returns:
         loss (torch.Tensor): KL divergence loss between the two gaussian distributions
     """
+    # the inverse variance is shared by both terms
+    inv_var_2 = torch.exp(-logvar_2)
     return -0.5 * (1. + \
         logvar_1 - logvar_2 \
-        - ((mu_2 - mu_1).pow(2) / logvar_2.exp()) \
-        - (logvar_1.exp() / logvar_2.exp()) \
+        - ((mu_2 - mu_1).pow(2) * inv_var_2) \
+        - (logvar_1.exp() * inv_var_2) \
         ).sum(dim=1).mean()
 
 
@@ -75,7 +103,7 @@ def log_normal(x, m, v):
     Returns:
         log_prob (torch.Tensor): log probabilities of shape (B, ...)
     """
-    element_wise = -0.5 * (torch.log(v) + (x - m).pow(2) / v + np.log(2 * np.pi))
+    element_wise = -0.5 * (torch.log(v) + (x - m).pow(2) / v + math.log(2. * math.pi))
     log_prob = element_wise.sum(-1)
     return log_prob
 
@@ -119,6 +147,32 @@ def log_normal_mixture(x, m, v, w=None, log_w=None):
     return log_prob
 
 
+def gmm_log_prob(x, means, scales, logits):
+    """
+    Log probability of tensor x under a batch of Gaussian mixtures with diagonal
+    covariances, computed directly from the mixture parameters. This matches
+    D.MixtureSameFamily with D.Independent(D.Normal) components, but skips building
+    the distribution objects and their argument checks.
+
+    Args:
+        x (torch.Tensor): tensor with shape (..., D)
+        means (torch.Tensor): means tensor with shape (..., M, D), where M is number
+            of mixture components
+        scales (torch.Tensor): standard deviations tensor with shape (..., M, D)
+        logits (torch.Tensor): unnormalized mixture logits with shape (..., M)
+
+    Returns:
+        log_prob (torch.Tensor): log probabilities of shape (...)
+    """
+    # (..., D) -> (..., 1, D) to broadcast across mixture components
+    z = (x.unsqueeze(-2) - means) / scales
+    # (..., M, D) -> (..., M) - the normalization constant is the same for every component,
+    # so it is added after the reduction over components instead of to every component
+    component_log_prob = -0.5 * (z * z).sum(-1) - torch.log(scales).sum(-1)
+    log_prob = torch.logsumexp(F.log_softmax(logits, dim=-1) + component_log_prob, dim=-1)
+    return log_prob - 0.5 * x.shape[-1] * math.log(2. * math.pi)
+
+
 def log_mean_exp(x, dim):
     """
     Compute the log(mean(exp(x), dim)) in a numerically stable manner.
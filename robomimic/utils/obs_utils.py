@@ -89,6 +89,10 @@ def obs_encoder_kwargs_from_config(obs_encoder_config):
     Returns:
         dict: Processed encoder kwargs
     """
+    # The default encoder cores and randomizers register themselves when their module is imported. Algorithm
+    # modules are imported lazily, so import it here to make sure they are registered before the checks below.
+    import robomimic.models.obs_core
+
     # Loop over each obs modality
     # Unlock encoder config
     obs_encoder_config.unlock()
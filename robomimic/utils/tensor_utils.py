@@ -255,7 +255,7 @@ def contiguous(x):
     )
 
 
-def to_device(x, device):
+def to_device(x, device, non_blocking=False):
     """
     Sends all torch tensors in nested dictionary or list or tuple to device
     @device, and returns a new nested structure.
@@ -263,6 +263,8 @@ def to_device(x, device):
     Args:
         x (dict or list or tuple): a possibly nested dictionary or list or tuple
         device (torch.Device): device to send tensors to
+        non_blocking (bool): if True, copies from pinned host memory to the GPU are
+            asynchronous with respect to the host
 
     Returns:
         y (dict or list or tuple): new nested dict-list-tuple
@@ -270,7 +272,32 @@ def to_device(x, device):
     return recursive_dict_list_tuple_apply(
         x,
         {
-            torch.Tensor: lambda x, d=device: x.to(d),
+            torch.Tensor: lambda x, d=device: x.to(d, non_blocking=non_blocking),
+            type(None): lambda x: x,
+        }
+    )
+
+
+def to_device_and_float(x, device, non_blocking=False):
+    """
+    Sends all torch tensors in nested dictionary or list or tuple to device
+    @device and converts them to float type entries, in a single pass over the
+    nested structure. Tensors are moved to the device before float conversion,
+    so that uint8 tensors (e.g. images) are transferred in their compact form.
+
+    Args:
+        x (dict or list or tuple): a possibly nested dictionary or list or tuple
+        device (torch.Device): device to send tensors to
+        non_blocking (bool): if True, copies from pinned host memory to the GPU are
+            asynchronous with respect to the host
+
+    Returns:
+        y (dict or list or tuple): new nested dict-list-tuple
+    """
+    return recursive_dict_list_tuple_apply(
+        x,
+        {
+            torch.Tensor: lambda x, d=device: x.to(d, non_blocking=non_blocking).float(),
             type(None): lambda x: x,
         }
     )
@@ -352,6 +379,25 @@ def to_list(x):
     )
 
 
+def scalars_to_floats(x):
+    """
+    Converts a flat dictionary of scalar torch tensors to a dictionary of python floats.
+    All values are gathered with a single device-to-host transfer, instead of one
+    synchronizing .item() call per tensor.
+
+    Args:
+        x (dict): dictionary of scalar (single-element) torch tensors
+
+    Returns:
+        y (OrderedDict): dictionary with the same keys, mapping to python floats
+    """
+    keys = list(x.keys())
+    if len(keys) == 0:
+        return collections.OrderedDict()
+    values = torch.stack([x[k].detach().reshape(()).float() for k in keys]).cpu().tolist()
+    return collections.OrderedDict(zip(keys, values))
+
+
 def to_float(x):
     """
     Converts all torch tensors and numpy arrays in nested dictionary or list 
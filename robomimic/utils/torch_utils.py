@@ -1,8 +1,12 @@
 """
 This file contains some PyTorch utilities.
 """
+import os
+import datetime
+import functools
 import numpy as np
 import torch
+import torch.distributed as dist
 import torch.optim as optim
 
 
@@ -36,7 +40,8 @@ def hard_update(source, target):
 def get_torch_device(try_to_use_cuda):
     """
     Return torch device. If using cuda (GPU), will also set cudnn.benchmark to True
-    to optimize CNNs.
+    to optimize CNNs. In distributed training (see @init_distributed), each process
+    uses the GPU given by its local rank.
 
     Args:
         try_to_use_cuda (bool): if True and cuda is available, will use GPU
@@ -46,12 +51,152 @@ def get_torch_device(try_to_use_cuda):
     """
     if try_to_use_cuda and torch.cuda.is_available():
         torch.backends.cudnn.benchmark = True
-        device = torch.device("cuda:0")
+        local_rank = int(os.environ.get("LOCAL_RANK", 0)) if is_distributed() else 0
+        torch.cuda.set_device(local_rank)
+        device = torch.device("cuda:{}".format(local_rank))
     else:
         device = torch.device("cpu")
     return device
 
 
+def init_distributed(try_to_use_cuda, timeout_minutes=120):
+    """
+    Initializes the default process group for multi-GPU data-parallel training, if the
+    process was launched with more than one worker by torchrun (which sets the WORLD_SIZE,
+    RANK, and LOCAL_RANK environment variables). Does nothing otherwise.
+
+    Args:
+        try_to_use_cuda (bool): if True and cuda is available, processes communicate with NCCL,
+            otherwise with Gloo
+
+        timeout_minutes (int): how long a collective call waits for the other processes before
+            failing. Other processes wait for the main process while it runs validation, rollouts,
+            and saves checkpoints, so this should be longer than those take.
+
+    Returns:
+        distributed (bool): True if the process group was initialized
+    """
+    if int(os.environ.get("WORLD_SIZE", 1)) <= 1:
+        return False
+    backend = "nccl" if (try_to_use_cuda and torch.cuda.is_available()) else "gloo"
+    if backend == "nccl":
+        # abort collectives on a failed rank instead of hanging until timeout, and free the buffers of
+        # async collectives when they are waited on rather than through caching allocator stream tracking
+        os.environ.setdefault("TORCH_NCCL_ASYNC_ERROR_HANDLING", "1")
+        os.environ.setdefault("TORCH_NCCL_AVOID_RECORD_STREAMS", "1")
+    dist.init_process_group(backend=backend, timeout=datetime.timedelta(minutes=timeout_minutes))
+    return True
+
+
+def is_distributed():
+    """
+    Returns True if running distributed training with an initialized process group.
+    """
+    return dist.is_available() and dist.is_initialized()
+
+
+def is_main_process():
+    """
+    Returns True for the process that is responsible for logging, rollouts, and checkpoints -
+    either the only process, or rank 0 in distributed training.
+    """
+    return (not is_distributed()) or (dist.get_rank() == 0)
+
+
+def barrier():
+    """
+    Blocks until every process in distributed training reaches this call. Does nothing if
+    not distributed.
+    """
+    if not is_distributed():
+        return
+    if dist.get_backend() == "nccl":
+        dist.barrier(device_ids=[torch.cuda.current_device()])
+    else:
+        dist.barrier()
+
+
+def broadcast_state_dict(state_dict):
+    """
+    Copies the tensors in @state_dict from the main process to all other processes in distributed
+    training. The tensors in a module state dict share storage with the module parameters and
+    buffers, so this can be used with @Algo.serialize to make every process start from the same
+    weights. Does nothing if not distributed.
+
+    Args:
+        state_dict (dict): possibly nested dictionary of tensors, such as the one returned by
+            @Algo.serialize
+    """
+    if not is_distributed():
+        return
+    for v in state_dict.values():
+        if isinstance(v, torch.Tensor):
+            dist.broadcast(v, src=0)
+        elif isinstance(v, dict):
+            broadcast_state_dict(v)
+
+
+def all_reduce_gradients(net):
+    """
+    Averages the gradients of @net across all processes in distributed training, so that
+    every process takes the same optimizer step. All gradients are flattened into a single
+    buffer so that only one collective call is needed. Does nothing if not distributed.
+
+    A parameter might not receive a gradient on every process (e.g. if a branch of the network
+    is skipped for some batches). Every process reduces a buffer with the same layout - missing
+    gradients count as zero, and a parameter ends up with a gradient on all processes if
+    it had one on any process.
+
+    Args:
+        net (torch.nn.Module): network whose gradients should be averaged
+    """
+    if not is_distributed():
+        return
+    params = [p for p in net.parameters() if p.requires_grad]
+    if len(params) == 0:
+        return
+    grads = [p.grad if p.grad is not None else torch.zeros_like(p) for p in params]
+    has_grad = torch.tensor([float(p.grad is not None) for p in params], dtype=grads[0].dtype, device=grads[0].device)
+    flat_grads = torch._utils._flatten_dense_tensors(grads + [has_grad])
+    dist.all_reduce(flat_grads)
+    flat_grads /= dist.get_world_size()
+    synced = torch._utils._unflatten_dense_tensors(flat_grads, grads + [has_grad])
+    for p, g, synced_g, any_grad in zip(params, grads, synced[:-1], synced[-1].tolist()):
+        if p.grad is None:
+            if any_grad == 0.:
+                # no process computed a gradient for this parameter
+                continue
+            p.grad = g
+        g.copy_(synced_g)
+
+
+def all_reduce_log(log, device):
+    """
+    Averages the metrics in @log across all processes in distributed training. All metrics are
+    packed into a single tensor so that only one collective call is needed. Timing statistics
+    (keys starting with "Time_") describe each process and are left as-is. Does nothing if
+    not distributed.
+
+    Args:
+        log (dict): dictionary of scalar metrics, such as the one returned by
+            @TrainUtils.run_epoch - every process must provide the same keys
+
+        device (torch.device): device used for communication - this should be the training device
+
+    Returns:
+        log (dict): dictionary with metrics averaged across processes
+    """
+    if not is_distributed():
+        return log
+    keys = sorted(k for k in log if not k.startswith("Time_"))
+    buf = torch.tensor([log[k] for k in keys], dtype=torch.float64, device=device)
+    dist.all_reduce(buf)
+    buf /= dist.get_world_size()
+    log = dict(log)
+    log.update(zip(keys, buf.tolist()))
+    return log
+
+
 def reparameterize(mu, logvar):
     """
     Reparameterize for the backpropagation of z instead of q.
@@ -86,6 +231,23 @@ def reparameterize(mu, logvar):
     return z
 
 
+@functools.lru_cache(maxsize=None)
+def n_step_discounts(discount, n_step):
+    """
+    Returns the per-step discount factors [1, gamma, ..., gamma^(n_step - 1)] used to
+    compute n-step returns. The result is cached, since it is requested with the same
+    arguments on every batch - callers must not modify it in-place.
+
+    Args:
+        discount (float): discount factor gamma
+        n_step (int): number of steps
+
+    Returns:
+        discounts (torch.Tensor): discount factors of shape [1, n_step]
+    """
+    return torch.pow(discount, torch.arange(n_step).float()).unsqueeze(0)
+
+
 def optimizer_from_optim_params(net_optim_params, net):
     """
     Helper function to return a torch Optimizer from the optim_params 
@@ -163,7 +325,7 @@ def lr_scheduler_from_optim_params(net_optim_params, net, optimizer):
     return lr_scheduler
 
 
-def backprop_for_loss(net, optim, loss, max_grad_norm=None, retain_graph=False):
+def backprop_for_loss(net, optim, loss, max_grad_norm=None, retain_graph=False, grad_scaler=None):
     """
     Backpropagate loss and update parameters for network with
     name @name.
@@ -179,27 +341,40 @@ def backprop_for_loss(net, optim, loss, max_grad_norm=None, retain_graph=False):
 
         retain_graph (bool): if True, graph is not freed after backward call
 
+        grad_scaler (torch.cuda.amp.GradScaler): if provided, used to scale the loss
+            before backpropagation (for float16 mixed precision training)
+
     Returns:
         grad_norms (float): average gradient norms from backpropagation
     """
 
     # backprop
     optim.zero_grad()
-    loss.backward(retain_graph=retain_graph)
+    if grad_scaler is not None:
+        grad_scaler.scale(loss).backward(retain_graph=retain_graph)
+        # average gradients across processes before unscaling, so that all processes agree on inf / nan checks
+        all_reduce_gradients(net)
+        # unscale gradients so that clipping and grad norms see their true values
+        grad_scaler.unscale_(optim)
+    else:
+        loss.backward(retain_graph=retain_graph)
+        all_reduce_gradients(net)
 
     # gradient clipping
     if max_grad_norm is not None:
         torch.nn.utils.clip_grad_norm_(net.parameters(), max_grad_norm)
 
-    # compute grad norms
-    grad_norms = 0.
-    for p in net.parameters():
-        # only clip gradients for parameters for which requires_grad is True
-        if p.grad is not None:
-            grad_norms += p.grad.data.norm(2).pow(2).item()
+    # compute grad norms - accumulate on device and transfer once, instead of
+    # synchronizing with an .item() call for every parameter
+    grad_norms = [p.grad.detach().norm(2).pow(2) for p in net.parameters() if p.grad is not None]
+    grad_norms = torch.stack(grad_norms).sum().item() if len(grad_norms) > 0 else 0.
 
     # step
-    optim.step()
+    if grad_scaler is not None:
+        grad_scaler.step(optim)
+        grad_scaler.update()
+    else:
+        optim.step()
 
     return grad_norms
 
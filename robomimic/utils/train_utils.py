@@ -493,11 +493,81 @@ def save_model(model, config, env_meta, shape_meta, ckpt_path, obs_normalization
         assert config.train.hdf5_normalize_obs
         obs_normalization_stats = deepcopy(obs_normalization_stats)
         params["obs_normalization_stats"] = TensorUtils.to_list(obs_normalization_stats)
-    torch.save(params, ckpt_path)
+    # write to a temporary file and move it into place, so that a run that is interrupted
+    # mid-write never leaves behind a truncated checkpoint
+    tmp_ckpt_path = ckpt_path + ".tmp"
+    torch.save(params, tmp_ckpt_path)
+    os.replace(tmp_ckpt_path, ckpt_path)
     print("save checkpoint to {}".format(ckpt_path))
 
 
-def run_epoch(model, data_loader, epoch, validate=False, num_steps=None, obs_normalization_stats=None):
+def _iterate_batches(data_loader, num_steps, timing_stats, device=None):
+    """
+    Generator over @num_steps batches from @data_loader, which restarts the data loader
+    whenever it is exhausted. If @device is provided, each batch is copied to it on a
+    separate CUDA stream while the previous batch is being trained on, so that host-to-device
+    copies overlap with computation.
+
+    Args:
+        data_loader (DataLoader instance): data loader to draw batches from
+
+        num_steps (int): number of batches to draw
+
+        timing_stats (dict): the time taken to load each batch is appended to its "Data_Loading" list
+
+        device (torch.device or None): if provided, CUDA device to prefetch batches to
+
+    Yields:
+        batch (dict): batch of data, already on @device if provided
+    """
+    stream = torch.cuda.Stream(device=device) if device is not None else None
+    data_loader_iter = iter(data_loader)
+
+    def load_batch():
+        nonlocal data_loader_iter
+        t = time.time()
+        try:
+            batch = next(data_loader_iter)
+        except StopIteration:
+            # reset for next dataset pass
+            data_loader_iter = iter(data_loader)
+            t = time.time()
+            batch = next(data_loader_iter)
+        if stream is not None:
+            with torch.cuda.stream(stream):
+                batch = TensorUtils.to_device(batch, device, non_blocking=True)
+        timing_stats["Data_Loading"].append(time.time() - t)
+        return batch
+
+    if stream is None:
+        for _ in range(num_steps):
+            yield load_batch()
+        return
+
+    batch = load_batch()
+    for step_i in range(num_steps):
+        # wait for the copies of this batch to finish, and let the caching allocator know
+        # that its memory is now in use on the current stream
+        current_stream = torch.cuda.current_stream(device)
+        current_stream.wait_stream(stream)
+        TensorUtils.map_tensor(batch, lambda x: x.record_stream(current_stream))
+
+        # start copying the next batch before handing this one off for training
+        next_batch = load_batch() if step_i < num_steps - 1 else None
+        yield batch
+        batch = next_batch
+
+
+def run_epoch(
+    model,
+    data_loader,
+    epoch,
+    validate=False,
+    num_steps=None,
+    obs_normalization_stats=None,
+    log_every_n_steps=1,
+    prefetch_to_device=False,
+):
     """
     Run an epoch of training or validation.
 
@@ -519,6 +589,14 @@ def run_epoch(model, data_loader, epoch, validate=False, num_steps=None, obs_nor
             with a "mean" and "std" of shape (1, ...) where ... is the default
             shape for the observation.
 
+        log_every_n_steps (int): only log metrics on every n-th batch, which allows the model to
+            skip computing logging outputs on the other batches. The returned metrics are averaged
+            across the logged batches only.
+
+        prefetch_to_device (bool): if True and the model is on a CUDA device, copy each batch to the
+            device on a separate stream one step ahead of training (see @_iterate_batches). This
+            requires the data loader to use pinned memory for the copies to be asynchronous.
+
     Returns:
         step_log_all (dict): dictionary of logged training metrics averaged across all batches
     """
@@ -534,19 +612,14 @@ def run_epoch(model, data_loader, epoch, validate=False, num_steps=None, obs_nor
     timing_stats = dict(Data_Loading=[], Process_Batch=[], Train_Batch=[], Log_Info=[])
     start_time = time.time()
 
-    data_loader_iter = iter(data_loader)
-    for _ in LogUtils.custom_tqdm(range(num_steps)):
+    prefetch_device = None
+    if prefetch_to_device and torch.device(model.device).type == "cuda":
+        prefetch_device = torch.device(model.device)
+    batch_iter = _iterate_batches(data_loader, num_steps, timing_stats, device=prefetch_device)
+    for step_i in LogUtils.custom_tqdm(range(num_steps)):
 
         # load next batch from data loader
-        try:
-            t = time.time()
-            batch = next(data_loader_iter)
-        except StopIteration:
-            # reset for next dataset pass
-            data_loader_iter = iter(data_loader)
-            t = time.time()
-            batch = next(data_loader_iter)
-        timing_stats["Data_Loading"].append(time.time() - t)
+        batch = next(batch_iter)
 
         # process batch for training
         t = time.time()
@@ -556,14 +629,19 @@ def run_epoch(model, data_loader, epoch, validate=False, num_steps=None, obs_nor
 
         # forward and backward pass
         t = time.time()
-        info = model.train_on_batch(input_batch, epoch, validate=validate)
+        log_this_step = (step_i % log_every_n_steps == 0)
+        if log_this_step:
+            info = model.train_on_batch(input_batch, epoch, validate=validate)
+        else:
+            info = model.train_on_batch(input_batch, epoch, validate=validate, log=False)
         timing_stats["Train_Batch"].append(time.time() - t)
 
         # tensorboard logging
-        t = time.time()
-        step_log = model.log_info(info)
-        step_log_all.append(step_log)
-        timing_stats["Log_Info"].append(time.time() - t)
+        if log_this_step:
+            t = time.time()
+            step_log = model.log_info(info)
+            step_log_all.append(step_log)
+            timing_stats["Log_Info"].append(time.time() - t)
 
     # flatten and take the mean of the metrics
     step_log_dict = {}
@@ -108,4 +108,5 @@ def depth_to_rgb(depth_map, depth_min=None, depth_max=None):
         assert depth_map.shape[-1] == 1
         depth_map = depth_map[..., 0]
     assert len(depth_map.shape) == 2 # [H, W]
-    return (255. * cm.hot(depth_map, 3)).astype(np.uint8)[..., :3]
+    # let the colormap index its uint8 lookup table directly instead of building a float RGBA image
+    return cm.hot(depth_map, bytes=True)[..., :3]
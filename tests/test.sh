@@ -14,3 +14,15 @@ echo "running tests for scripts..."
 python test_scripts.py
 echo "running tests for examples..."
 python test_examples.py
+echo "running tests for loss utils..."
+python test_loss_utils.py
+echo "running tests for bc export..."
+python test_bc_export.py
+echo "running tests for dataset..."
+python test_dataset.py
+echo "running tests for train utils..."
+python test_train_utils.py
+echo "running tests for config..."
+python test_config.py
+echo "running tests for imports..."
+python test_imports.py
@@ -0,0 +1,72 @@
+"""
+Test script for the ahead-of-time compiled rollout policy of BC_Transformer.
+Exports a small transformer policy with @export_for_inference and checks that
+@get_action calls the compiled graph with the same inputs it was exported with,
+and returns the same actions as the eager policy. The test is skipped on
+torch < 2.6.
+"""
+import torch
+
+from robomimic.config import config_factory
+from robomimic.algo import algo_factory
+import robomimic.utils.obs_utils as ObsUtils
+
+
+TORCH_VERSION = tuple(int(v) for v in torch.__version__.split("+")[0].split(".")[:2])
+
+
+def get_transformer_model():
+    """
+    Small BC_Transformer model on low-dim observations.
+    """
+    config = config_factory("bc")
+    with config.values_unlocked():
+        config.observation.modalities.obs.low_dim = ["robot0_eef_pos", "object"]
+        config.observation.modalities.obs.rgb = []
+        config.algo.transformer.enabled = True
+        config.algo.transformer.context_length = 3
+        config.algo.transformer.embed_dim = 32
+        config.algo.transformer.num_layers = 2
+        config.algo.transformer.num_heads = 2
+        config.algo.gmm.enabled = False
+        config.algo.rnn.enabled = False
+        config.train.frame_stack = 3
+        config.train.seq_length = 1
+    ObsUtils.initialize_obs_utils_with_config(config)
+    model = algo_factory(
+        algo_name="bc",
+        config=config,
+        obs_key_shapes={"robot0_eef_pos": [3], "object": [10]},
+        ac_dim=7,
+        device=torch.device("cpu"),
+    )
+    model.set_eval()
+    return model
+
+
+def test_export_for_inference():
+    torch.manual_seed(0)
+    model = get_transformer_model()
+    obs_dict = {"robot0_eef_pos": torch.randn(1, 3, 3), "object": torch.randn(1, 3, 10)}
+
+    expected = model.get_action(obs_dict=obs_dict)
+    model.export_for_inference(obs_dict=obs_dict)
+    assert model._aot_policy is not None
+
+    # same inputs as used for export, and new inputs with the same shapes
+    action = model.get_action(obs_dict=obs_dict)
+    assert torch.allclose(action, expected, atol=1e-4)
+    new_obs_dict = {k: torch.randn_like(v) for k, v in obs_dict.items()}
+    model._aot_policy, aot_policy = None, model._aot_policy
+    expected = model.get_action(obs_dict=new_obs_dict)
+    model._aot_policy = aot_policy
+    action = model.get_action(obs_dict=new_obs_dict)
+    assert torch.allclose(action, expected, atol=1e-4)
+
+
+if __name__ == "__main__":
+    if TORCH_VERSION < (2, 6):
+        print("bc export: skipped (export_for_inference requires torch >= 2.6)")
+    else:
+        test_export_for_inference()
+        print("bc export: passed!")
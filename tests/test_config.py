@@ -0,0 +1,89 @@
+"""
+Test script for building configs with @config_factory. Default configs are built once
+per algo name and cloned on return, so these tests check that every returned config
+is an independent copy with the same contents, class, and lock state as a freshly
+constructed config.
+"""
+from robomimic.config import Config, config_factory, get_all_registered_configs
+from robomimic.config.base_config import _default_config
+from robomimic.config.bc_config import BCConfig
+
+
+def get_lock_states(config):
+    """
+    Lock state of every nested config, keyed by the path to the nested config.
+    """
+    states = {(): (config.is_locked, config.is_key_locked, config.key_lockable)}
+    for k, v in config.items():
+        if isinstance(v, Config):
+            for path, state in get_lock_states(v).items():
+                states[(k,) + path] = state
+    return states
+
+
+def test_config_factory_matches_constructor():
+    for algo_name in sorted(get_all_registered_configs()):
+        config = config_factory(algo_name)
+        expected = get_all_registered_configs()[algo_name]()
+        assert type(config) is type(expected), algo_name
+        assert config.to_dict() == expected.to_dict(), algo_name
+        assert get_lock_states(config) == get_lock_states(expected), algo_name
+
+
+def test_config_factory_returns_independent_copies():
+    config = config_factory("bc")
+    config.train.batch_size = 7
+    config.observation.modalities.obs.low_dim.append("new_key")
+    config.observation.encoder.rgb.core_kwargs.new_kwarg = 1
+    config.lock()
+
+    other = config_factory("bc")
+    assert other is not config
+    assert other.train.batch_size == BCConfig().train.batch_size
+    assert "new_key" not in other.observation.modalities.obs.low_dim
+    assert "new_kwarg" not in other.observation.encoder.rgb.core_kwargs
+    assert not other.is_locked
+
+
+def test_clone_keeps_lock_state():
+    config = config_factory("bc")
+    config.lock()
+    clone = config.clone()
+    assert type(clone) is type(config)
+    assert clone.to_dict() == config.to_dict()
+    assert get_lock_states(clone) == get_lock_states(config)
+    try:
+        clone.train.new_key = 1
+        raise AssertionError("adding a key to a locked config should fail")
+    except RuntimeError:
+        pass
+    with clone.values_unlocked():
+        clone.train.batch_size = 3
+    assert config.train.batch_size != 3
+
+
+def test_config_factory_after_registering_config():
+    # registering a config class invalidates the cached default configs
+    config_factory("bc")
+    assert _default_config.cache_info().currsize > 0
+
+    class MemoTestConfig(BCConfig):
+        ALGO_NAME = "memo_test_bc"
+
+        def train_config(self):
+            super(MemoTestConfig, self).train_config()
+            self.train.batch_size = 11
+
+    assert _default_config.cache_info().currsize == 0
+    config = config_factory("memo_test_bc")
+    assert type(config) is MemoTestConfig
+    assert config.algo_name == "memo_test_bc"
+    assert config.train.batch_size == 11
+
+
+if __name__ == "__main__":
+    test_config_factory_matches_constructor()
+    test_config_factory_returns_independent_copies()
+    test_clone_keeps_lock_state()
+    test_config_factory_after_registering_config()
+    print("config: passed!")
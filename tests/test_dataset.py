@@ -0,0 +1,76 @@
+"""
+Test script for loading hdf5 datasets into memory with SequenceDataset. Writes a
+small hdf5 file with integer, boolean, and missing or empty reward and done
+datasets, and checks that the cached data matches reading and casting each
+dataset directly. Can be run directly or with pytest.
+"""
+import os
+import tempfile
+
+import h5py
+import numpy as np
+
+import robomimic.utils.obs_utils as ObsUtils
+from robomimic.utils.dataset import SequenceDataset
+
+
+OBS_KEYS = ["robot0_eef_pos"]
+DATASET_KEYS = ["actions", "rewards", "dones"]
+
+
+def make_dataset(hdf5_path):
+    """
+    Writes a small hdf5 dataset with demonstrations of different lengths, where demo_0 stores
+    integer rewards and boolean dones, demo_1 stores float rewards and no dones, and demo_2
+    stores empty rewards and dones.
+    """
+    np.random.seed(0)
+    with h5py.File(hdf5_path, "w") as f:
+        data = f.create_group("data")
+        for i, n in enumerate([7, 5, 4]):
+            ep = data.create_group("demo_{}".format(i))
+            ep.attrs["num_samples"] = n
+            for obs_group in ["obs", "next_obs"]:
+                ep.create_dataset("{}/robot0_eef_pos".format(obs_group), data=np.random.randn(n, 3))
+            ep.create_dataset("actions", data=np.random.uniform(-1., 1., size=(n, 2)))
+            if i == 0:
+                ep.create_dataset("rewards", data=np.arange(n, dtype=np.int64))
+                ep.create_dataset("dones", data=(np.arange(n) == n - 1))
+            elif i == 1:
+                ep.create_dataset("rewards", data=np.random.randn(n))
+            else:
+                ep.create_dataset("rewards", data=np.zeros((0,), dtype=np.float64))
+                ep.create_dataset("dones", data=np.zeros((0,), dtype=bool))
+        data.attrs["total"] = 16
+        data.attrs["env_args"] = "{}"
+
+
+def test_load_dataset_in_memory():
+    ObsUtils.initialize_obs_utils_with_obs_specs(obs_modality_specs={"obs": {"low_dim": OBS_KEYS}})
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        hdf5_path = os.path.join(tmp_dir, "dataset.hdf5")
+        make_dataset(hdf5_path)
+        dataset = SequenceDataset(
+            hdf5_path=hdf5_path,
+            obs_keys=OBS_KEYS,
+            dataset_keys=DATASET_KEYS,
+            hdf5_cache_mode="low_dim",
+            hdf5_use_swmr=False,
+        )
+        with h5py.File(hdf5_path, "r") as f:
+            for ep in dataset.demos:
+                cached = dataset.hdf5_cache[ep]
+                for k in DATASET_KEYS:
+                    if k in f["data/{}".format(ep)]:
+                        expected = f["data/{}/{}".format(ep, k)][()].astype("float32")
+                    else:
+                        expected = np.zeros((f["data/{}".format(ep)].attrs["num_samples"], 1), dtype=np.float32)
+                    assert cached[k].dtype == np.float32, (ep, k, cached[k].dtype)
+                    assert cached[k].shape == expected.shape, (ep, k, cached[k].shape, expected.shape)
+                    assert np.array_equal(cached[k], expected), (ep, k)
+        dataset.close_and_delete_hdf5_handle()
+
+
+if __name__ == "__main__":
+    test_load_dataset_in_memory()
+    print("dataset: passed!")
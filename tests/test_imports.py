@@ -0,0 +1,46 @@
+"""
+Test script for lazy imports in robomimic. Checks that importing the algo and config
+packages does not import the per-algorithm modules, and that those modules are
+imported when an algorithm's classes or configs are first looked up.
+"""
+import subprocess
+import sys
+
+
+def run_in_new_interpreter(code):
+    """
+    Runs @code in a fresh python interpreter (so that no robomimic modules are imported yet)
+    and returns the True / False values it printed (other output, such as warnings, is ignored).
+    """
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return [word for word in out.split() if word in ("True", "False")]
+
+
+def test_algo_modules_imported_lazily():
+    out = run_in_new_interpreter(
+        "import sys\n"
+        "import robomimic.algo\n"
+        "print('robomimic.algo.bc' in sys.modules)\n"
+        "robomimic.algo.BC\n"
+        "print('robomimic.algo.bc' in sys.modules, 'robomimic.algo.cql' in sys.modules)\n"
+        "robomimic.algo.algo_name_to_factory_func('cql')\n"
+        "print('robomimic.algo.cql' in sys.modules)\n"
+    )
+    assert out == ["False", "True", "False", "True"], out
+
+
+def test_config_modules_imported_lazily():
+    out = run_in_new_interpreter(
+        "import sys\n"
+        "import robomimic.config\n"
+        "print('robomimic.config.bc_config' in sys.modules)\n"
+        "robomimic.config.config_factory('bc')\n"
+        "print('robomimic.config.bc_config' in sys.modules, 'robomimic.config.cql_config' in sys.modules)\n"
+    )
+    assert out == ["False", "True", "False"], out
+
+
+if __name__ == "__main__":
+    test_algo_modules_imported_lazily()
+    test_config_modules_imported_lazily()
+    print("imports: passed!")
@@ -0,0 +1,114 @@
+"""
+Test script for the batch iteration used by @TrainUtils.run_epoch. Checks that
+the batches served to the model match plain iteration over the data loader,
+including when an epoch is shorter or longer than a pass through the data loader,
+and when batches are prefetched to the device.
+"""
+import torch
+from torch.utils.data import DataLoader, Dataset
+
+import robomimic.utils.train_utils as TrainUtils
+
+
+class DictDataset(Dataset):
+    """
+    Small dataset of dictionary samples, like the ones served by SequenceDataset.
+    """
+    def __init__(self, n):
+        self.n = n
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, index):
+        return dict(obs=dict(x=torch.full((2,), float(index))), actions=torch.tensor([float(index)]))
+
+
+class RecordingModel:
+    """
+    Minimal stand-in for an Algo instance that records the batches it is trained on.
+    """
+    def __init__(self, device):
+        self.device = device
+        self.batches = []
+
+    def set_train(self):
+        pass
+
+    def set_eval(self):
+        pass
+
+    def process_batch_for_training(self, batch):
+        return batch
+
+    def postprocess_batch_for_training(self, batch, obs_normalization_stats):
+        return batch
+
+    def train_on_batch(self, batch, epoch, validate=False, log=True):
+        self.batches.append(batch)
+        return dict(loss=batch["actions"].mean())
+
+    def log_info(self, info):
+        return dict(Loss=info["loss"].item())
+
+
+def make_loader(n=10, batch_size=3):
+    # drop_last and no shuffling, so that every pass through the loader serves the same batches
+    return DataLoader(DictDataset(n), batch_size=batch_size, shuffle=False, drop_last=True)
+
+
+def plain_batches(data_loader, num_steps):
+    """
+    Batches from restarting plain iteration over @data_loader until @num_steps batches are drawn.
+    """
+    batches = []
+    while len(batches) < num_steps:
+        for batch in data_loader:
+            batches.append(batch)
+            if len(batches) == num_steps:
+                break
+    return batches
+
+
+def assert_same_batches(batches, expected):
+    assert len(batches) == len(expected)
+    for batch, expected_batch in zip(batches, expected):
+        assert torch.equal(batch["actions"].cpu(), expected_batch["actions"])
+        assert torch.equal(batch["obs"]["x"].cpu(), expected_batch["obs"]["x"])
+
+
+def test_iterate_batches():
+    # the loader has 3 batches, so this covers epochs shorter and longer than a pass through it
+    data_loader = make_loader()
+    for num_steps in [1, 2, 3, 7]:
+        timing_stats = dict(Data_Loading=[])
+        batches = list(TrainUtils._iterate_batches(data_loader, num_steps, timing_stats))
+        assert_same_batches(batches, plain_batches(data_loader, num_steps))
+        assert len(timing_stats["Data_Loading"]) == num_steps
+
+
+def test_run_epoch_prefetch_cpu_fallback():
+    # prefetching only applies to CUDA models, so a CPU model is served the batches directly
+    data_loader = make_loader()
+    model = RecordingModel(device=torch.device("cpu"))
+    step_log = TrainUtils.run_epoch(model=model, data_loader=data_loader, epoch=1, num_steps=5, prefetch_to_device=True)
+    assert_same_batches(model.batches, plain_batches(data_loader, 5))
+    assert "Loss" in step_log and "Time_Data_Loading" in step_log
+
+
+def test_iterate_batches_prefetch_to_device():
+    # prefetching to the device requires CUDA - only run when a GPU is available
+    data_loader = make_loader()
+    device = torch.device("cuda:0")
+    timing_stats = dict(Data_Loading=[])
+    batches = list(TrainUtils._iterate_batches(data_loader, 7, timing_stats, device=device))
+    assert all(batch["actions"].device == device for batch in batches)
+    assert_same_batches(batches, plain_batches(data_loader, 7))
+
+
+if __name__ == "__main__":
+    test_iterate_batches()
+    test_run_epoch_prefetch_cpu_fallback()
+    if torch.cuda.is_available():
+        test_iterate_batches_prefetch_to_device()
+    print("train utils: passed!")